@@ -8,32 +8,75 @@ Aplikasi utama untuk sistem absensi dengan pengenalan wajah.
 import os
 import sys
 import time
-import json
+import queue
 import logging
+import logging.handlers
+import threading
+from collections import deque, OrderedDict
 import tkinter as tk
 from tkinter import messagebox, ttk
 from datetime import datetime
 from PIL import Image, ImageTk
+import numpy as np
 import cv2
 
+# Gunakan orjson (parser C) jika tersedia, fallback ke json bawaan
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 # Import modul face detector dan database handler
 sys.path.append('src')
 from face_detector import FaceDetector
 from database_handler import DatabaseHandler
 
-# Konfigurasi logging
+# Konfigurasi logging: logger hanya memasukkan record ke queue, penulisan ke
+# file/console dilakukan QueueListener di background thread. force=True karena
+# modul di src/ sudah memanggil basicConfig saat diimport.
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(
+    log_queue,
+    logging.FileHandler('logs/app.log'),
+    logging.StreamHandler()
+)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/app.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(log_queue)],
+    force=True
 )
+log_listener.start()
 
 logger = logging.getLogger(__name__)
 
+# Backend kamera per platform agar buffer internal driver bisa dibatasi
+if sys.platform.startswith('win'):
+    CAMERA_BACKEND = cv2.CAP_DSHOW
+elif sys.platform.startswith('linux'):
+    CAMERA_BACKEND = cv2.CAP_V4L2
+else:
+    CAMERA_BACKEND = cv2.CAP_ANY
+
+# Lebar frame untuk deteksi wajah, tidak bergantung resolusi kamera; kotak
+# wajah diskalakan kembali ke ukuran frame asli oleh FaceDetector
+DETECT_WIDTH = 320
+
+# Interval antar frame kamera (~30 FPS), dipakai untuk membuang frame basi
+CAMERA_FRAME_INTERVAL = 1 / 30
+
+# Resolusi capture kamera; MJPG menghindari decode YUY2 mentah dari driver
+CAMERA_WIDTH = 640
+CAMERA_HEIGHT = 480
+CAMERA_FOURCC = cv2.VideoWriter_fourcc(*'MJPG')
+
+# Umur cache data absensi (detik); entri juga dibuang saat ada absensi baru
+ATTENDANCE_CACHE_TTL = 2.0
+
 class AttendanceApp:
+    # Pilihan nomor pertemuan (1-16), dibuat sekali untuk semua sesi
+    _MEETING_VALUES = tuple(str(i) for i in range(1, 17))
+    
     def __init__(self, root):
         """
         Inisialisasi aplikasi absensi.
@@ -57,30 +100,83 @@ class AttendanceApp:
         self.detector = None
         self.camera = None
         self.camera_label = None
+        self._label_size = (0, 0)  # Ukuran label kamera, diupdate lewat event <Configure>
+        self._imgtk = None         # PhotoImage yang dipakai ulang untuk tampilan kamera
+        self._resize_buf = None    # Buffer hasil resize yang dipakai ulang setiap frame
+        self._rgb_buf = None       # Buffer hasil konversi BGR->RGB yang dipakai ulang
+        self._pending_attendance = []      # Pengenalan yang belum ditampilkan di UI
+        self._attendance_flush_job = None  # ID after_idle untuk _flush_attendance
+        self._last_status_update = {}      # student_id -> waktu monotonic update status terakhir
+        self._att_cache = {}               # (class_code, meeting) -> (waktu, data absensi)
+        self._failed_attendance = deque()  # (nim, name, pesan) gagal ditulis, diisi thread penulis
+        self._frame_q = queue.Queue(maxsize=1)  # Slot tunggal: frame terbaru menang
+        self._capture_thread = None
+        self._camera_job = None    # ID after untuk update_camera
+        self.input_frame = None    # Tampilan input kelas, dibuat sekali saat pertama dibuka
+        self._detector_ready = threading.Event()
+        self._detector_wait_job = None
+        self._camera_view_alive = False  # True selama widget tampilan absensi masih ada
+        self._last_date = None     # Tanggal terakhir yang ditampilkan di tampilan utama
+        self._clock_job = None     # ID after untuk update_clock
+        self._status_reset_job = None  # ID after untuk _reset_status_label
+        self._classes_mtime = None # mtime classes.json saat terakhir dimuat
         self.classes_data = self.load_classes_data()
-        self.attendance_history = []  # List untuk menyimpan history absensi
+        self.attendance_history = deque(maxlen=10)  # History absensi, terbaru di depan
+        self._recent_student_ids = OrderedDict()    # 5 mahasiswa terakhir di history
         self.sidebar_open = False     # Status sidebar (awalnya tertutup)
+        self._history_listbox_stale = False  # True jika history berubah saat sidebar tertutup
         
         # Inisialisasi database handler
         self.db_handler = DatabaseHandler()
+        
+        # Buang cache absensi setiap kali thread penulis mencatat absensi baru
+        self.db_handler.on_attendance_written = self.invalidate_attendance_cache
+        self.db_handler.on_attendance_failed = self._on_attendance_failed
+        
         logger.info("Database handler initialized")
         
+        # Muat model pengenalan wajah di background selagi user mengisi form
+        threading.Thread(target=self._warm_detector, daemon=True).start()
+        
         # Setup UI
         self.setup_ui()
         
         # Mulai timer untuk update waktu
         self.update_clock()
         
+    def _warm_detector(self):
+        """Membuat FaceDetector di background thread saat aplikasi dimulai."""
+        try:
+            detector = FaceDetector(db_handler=self.db_handler, detect_width=DETECT_WIDTH)
+            detector.build_index()
+            self.detector = detector
+            logger.info("Face detector preloaded")
+        except Exception as e:
+            logger.error(f"Error saat memuat face detector: {str(e)}")
+        finally:
+            self._detector_ready.set()
+            
     def load_classes_data(self):
-        """Load class data from JSON file."""
+        """Load class data from JSON file and index it by class code."""
         try:
-            with open('classes.json', 'r') as f:
-                data = json.load(f)
+            # Tidak perlu parse ulang jika file belum berubah
+            mtime = os.path.getmtime('classes.json')
+            if mtime == self._classes_mtime:
+                return self.classes_data
+                
+            with open('classes.json', 'rb') as f:
+                data = _json.loads(f.read())
                 logger.info(f"Loaded {len(data['classes'])} classes from classes.json")
-                return data
+            self._classes_mtime = mtime
         except Exception as e:
             logger.error(f"Error loading classes data: {str(e)}")
-            return {"classes": []}
+            data = {"classes": []}
+            
+        # Index kelas berdasarkan kode untuk lookup O(1)
+        self._class_by_code = {cls["class_code"]: cls for cls in data["classes"]}
+        self._class_codes = tuple(self._class_by_code)
+        self._valid_pins = {(cls["class_code"], cls["pin"]): cls["class_name"] for cls in data["classes"]}
+        return data
             
         
     def setup_ui(self):
@@ -155,26 +251,49 @@ class AttendanceApp:
         self.status_label.pack()
         
     def update_clock(self):
-        """Update tampilan jam dan tanggal."""
+        """Timer tunggal untuk jam pada tampilan yang sedang aktif."""
         now = datetime.now()
-        time_str = now.strftime("%H:%M:%S")
-        date_str = now.strftime("%A, %d %B %Y")
         
-        self.clock_label.config(text=time_str)
-        self.date_label.config(text=date_str)
+        if self.main_frame.winfo_manager():
+            self.update_main_clock(now)
+        if self._camera_view_alive:
+            self.update_attendance_clock(now)
+        
+        # Jadwalkan update berikutnya tepat di pergantian detik agar jam tidak
+        # bergeser (drift) akibat waktu eksekusi callback
+        self._clock_job = self.root.after(1000 - now.microsecond // 1000, self.update_clock)
+        
+    def update_main_clock(self, now):
+        """
+        Update tampilan jam dan tanggal pada tampilan utama.
+        
+        Args:
+            now: Waktu saat ini (datetime)
+        """
+        self.clock_label.config(text=now.strftime("%H:%M:%S"))
         
-        # Schedule the next update after 1000ms (1 second)
-        self.root.after(1000, self.update_clock)
+        # Tanggal hanya berubah sekali sehari
+        if now.date() != self._last_date:
+            self.date_label.config(text=now.strftime("%A, %d %B %Y"))
+            self._last_date = now.date()
         
     def start_attendance(self):
         """Memulai proses absensi dengan pengenalan wajah."""
         # Sembunyikan tampilan utama
         self.main_frame.pack_forget()
         
-        # Buat tampilan input kode kelas
-        self.input_frame = tk.Frame(self.root, bg=self.bg_color)
+        # Buat tampilan input kode kelas sekali, selanjutnya cukup direset
+        if self.input_frame is None:
+            self.setup_input_ui()
+        else:
+            self.reset_input_ui()
+            
         self.input_frame.pack(fill=tk.BOTH, expand=True)
         
+    def setup_input_ui(self):
+        """Setup elemen UI untuk input informasi kelas."""
+        self.input_frame = tk.Frame(self.root, bg=self.bg_color)
+        
         # Frame untuk judul
         title_frame = tk.Frame(self.input_frame, bg=self.bg_color, pady=20)
         title_frame.pack(fill=tk.X)
@@ -202,16 +321,13 @@ class AttendanceApp:
         )
         class_label.grid(row=0, column=0, sticky="w", pady=10, padx=10)
         
-        # Get class codes for dropdown
-        class_codes = [cls["class_code"] for cls in self.classes_data["classes"]]
-        
         self.class_var = tk.StringVar()
         self.class_combo = ttk.Combobox(
             form_frame,
             textvariable=self.class_var,
             font=('Helvetica', 16),
             width=20,
-            values=class_codes
+            values=self._class_codes
         )
         self.class_combo.grid(row=0, column=1, pady=10, padx=10)
         self.class_combo.bind("<<ComboboxSelected>>", self.on_class_selected)
@@ -255,13 +371,12 @@ class AttendanceApp:
         meeting_label.grid(row=2, column=0, sticky="w", pady=10, padx=10)
         
         self.meeting_var = tk.StringVar()
-        meeting_values = [str(i) for i in range(1, 17)]  # Pertemuan 1-16
         self.meeting_combo = ttk.Combobox(
             form_frame,
             textvariable=self.meeting_var,
             font=('Helvetica', 16),
             width=20,
-            values=meeting_values
+            values=self._MEETING_VALUES
         )
         self.meeting_combo.grid(row=2, column=1, pady=10, padx=10)
         self.meeting_combo.current(0)  # Default ke pertemuan 1
@@ -306,14 +421,18 @@ class AttendanceApp:
         )
         self.error_label.pack(pady=10)
         
+    def reset_input_ui(self):
+        """Kosongkan kembali isian form input kelas."""
+        self.class_var.set("")
+        self.class_name_label.config(text="")
+        self.pin_entry.delete(0, tk.END)
+        self.meeting_combo.current(0)  # Default ke pertemuan 1
+        self.error_label.config(text="")
+        
     def on_class_selected(self, event):
         """Update class name label when class is selected."""
-        selected_code = self.class_var.get()
-        for cls in self.classes_data["classes"]:
-            if cls["class_code"] == selected_code:
-                self.class_name_label.config(text=cls["class_name"])
-                return
-        self.class_name_label.config(text="")
+        cls = self._class_by_code.get(self.class_var.get())
+        self.class_name_label.config(text=cls["class_name"] if cls else "")
         
     def confirm_attendance(self):
         """Konfirmasi input dan lanjut ke tampilan absensi."""
@@ -335,31 +454,25 @@ class AttendanceApp:
             return
         
         # Validasi PIN dengan data dari classes.json
-        valid_pin = False
-        class_name = ""
-        for cls in self.classes_data["classes"]:
-            if cls["class_code"] == class_code and cls["pin"] == pin_code:
-                valid_pin = True
-                class_name = cls["class_name"]
-                break
-                
-        if not valid_pin:
+        class_name = self._valid_pins.get((class_code, pin_code))
+        if class_name is None:
             self.error_label.config(text="PIN kelas tidak valid!")
             return
             
-        # Bersihkan tampilan input
-        self.input_frame.destroy()
+        # Sembunyikan tampilan input
+        self.input_frame.pack_forget()
         
         # Buka tampilan absensi
         self.open_attendance_view(class_code, class_name, int(meeting_number))
         
     def back_to_main(self):
         """Kembali ke tampilan utama."""
-        # Hapus tampilan input
-        self.input_frame.destroy()
+        # Sembunyikan tampilan input
+        self.input_frame.pack_forget()
         
         # Tampilkan kembali tampilan utama
         self.main_frame.pack(fill=tk.BOTH, expand=True)
+        self.update_main_clock(datetime.now())
         
     def open_attendance_view(self, class_code, class_name, meeting_number):
         """
@@ -372,8 +485,10 @@ class AttendanceApp:
             meeting_number: Nomor pertemuan
         """
         # Reset history absensi untuk sesi baru
-        self.attendance_history = []
+        self.attendance_history.clear()
+        self._recent_student_ids.clear()
         self.sidebar_open = False  # Status sidebar (awalnya tertutup)
+        self._history_listbox_stale = False
         
         # Sembunyikan tampilan utama
         self.main_frame.pack_forget()
@@ -416,8 +531,8 @@ class AttendanceApp:
         )
         self.time_label.pack(side=tk.RIGHT, padx=20)
         
-        # Mulai timer untuk tampilan waktu pada tampilan absensi
-        self.update_attendance_clock()
+        # Tampilkan waktu sekarang; selanjutnya diupdate oleh timer update_clock
+        self.update_attendance_clock(datetime.now())
         
         # ------- PENGATURAN LAYOUT UTAMA -------
         # Layout diubah untuk menggunakan grid agar lebih terkontrol
@@ -456,6 +571,9 @@ class AttendanceApp:
         
         self.camera_label = tk.Label(self.camera_frame, bg="black")
         self.camera_label.pack(fill=tk.BOTH, expand=True)
+        self.camera_label.bind("<Configure>", self.on_camera_label_resized)
+        self._label_size = (0, 0)
+        self._imgtk = None
         
         # Sidebar untuk riwayat absensi (hidden awalnya)
         sidebar_width = 250
@@ -520,7 +638,26 @@ class AttendanceApp:
         self.active_class_code = class_code
         self.active_meeting = meeting_number
         
-        # Mulai kamera dan pengenalan wajah
+        self._camera_view_alive = True
+        
+        # Mulai kamera dan pengenalan wajah setelah model siap
+        self.is_camera_active = True
+        self.wait_for_detector()
+        
+    def wait_for_detector(self):
+        """Menunggu FaceDetector selesai dimuat tanpa memblokir UI, lalu memulai kamera."""
+        self._detector_wait_job = None
+        
+        # Tampilan absensi sudah ditutup selama menunggu
+        if not self.is_camera_active:
+            return
+            
+        if not self._detector_ready.is_set():
+            self.attendance_status_label.config(text="Memuat model pengenalan wajah...")
+            self._detector_wait_job = self.root.after(100, self.wait_for_detector)
+            return
+            
+        self.attendance_status_label.config(text="Menunggu pengenalan wajah...")
         self.start_camera()
 
     def toggle_sidebar(self):
@@ -536,90 +673,252 @@ class AttendanceApp:
             self.toggle_button.config(text="≪ Sembunyikan Riwayat")
             self.sidebar_open = True
             
-            # Update isi listbox
-            self.history_listbox.delete(0, tk.END)
-            for entry in self.attendance_history:
-                self.history_listbox.insert(tk.END, entry)
+            # Isi ulang listbox hanya jika history berubah selama sidebar tertutup
+            if self._history_listbox_stale:
+                self.history_listbox.delete(0, tk.END)
+                self.history_listbox.insert(tk.END, *self.attendance_history)
+                self._history_listbox_stale = False
 
 
-    def update_attendance_clock(self):
-        """Update tampilan jam pada view absensi."""
-        if hasattr(self, 'time_label') and self.time_label.winfo_exists():
-            now = datetime.now()
-            time_str = now.strftime("%H:%M:%S")
-            date_str = now.strftime("%d/%m/%Y")
-            
-            self.time_label.config(text=f"{date_str} {time_str}")
-            
-            # Schedule next update
-            self.root.after(1000, self.update_attendance_clock)
+    def update_attendance_clock(self, now):
+        """
+        Update tampilan jam pada view absensi.
+        
+        Args:
+            now: Waktu saat ini (datetime)
+        """
+        self.time_label.config(text=now.strftime("%d/%m/%Y %H:%M:%S"))
         
     def start_camera(self):
         """Memulai kamera dan pengenalan wajah."""
         self.is_camera_active = True
         
-        # Inisialisasi face detector dengan database handler
-        self.detector = FaceDetector(db_handler=self.db_handler)
+        # Fallback jika preload gagal; detector dipakai ulang di sesi berikutnya
+        if self.detector is None:
+            self.detector = FaceDetector(db_handler=self.db_handler, detect_width=DETECT_WIDTH)
         
         # Set kelas aktif di detector
         self.detector.set_active_class(self.active_class_code, self.active_meeting)
         
-        # Inisialisasi kamera
-        self.camera = cv2.VideoCapture(0)  # 0 = default camera
+        # Cek ulang file encoding (mungkin di-training ulang sejak sesi sebelumnya);
+        # index hanya dibangun ulang jika file berubah
+        self.detector.mark_index_dirty()
         
-        if not self.camera.isOpened():
-            messagebox.showerror("Error", "Tidak dapat mengakses kamera!")
-            self.close_attendance_view()
-            return
+        # Inisialisasi kamera jika belum terbuka dari sesi sebelumnya
+        if self.camera is None or not self.camera.isOpened():
+            self.camera = cv2.VideoCapture(0, CAMERA_BACKEND)  # 0 = default camera
+            
+            if not self.camera.isOpened():
+                messagebox.showerror("Error", "Tidak dapat mengakses kamera!")
+                self.release_camera()
+                self.close_attendance_view()
+                return
+            
+            # Batasi buffer agar read() selalu mengembalikan frame terbaru
+            self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self.camera.set(cv2.CAP_PROP_FOURCC, CAMERA_FOURCC)
+            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+        
+        # Capture dan pengenalan wajah berjalan di thread terpisah
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
             
         # Mulai update frame kamera
         self.update_camera()
         
-    def update_camera(self):
-        """Update tampilan kamera dan melakukan pengenalan wajah."""
-        if self.is_camera_active and hasattr(self, 'camera_label') and self.camera_label.winfo_exists():
-            ret, frame = self.camera.read()
-            
-            if ret:
-                # Proses frame untuk pengenalan wajah
-                processed_frame, recognized_people = self.detector.recognize_faces(frame)
+    def _capture_loop(self):
+        """Membaca frame kamera dan melakukan pengenalan wajah di luar thread UI."""
+        processing_time = 0.0
+        while self.is_camera_active:
+            # Jika pemrosesan frame sebelumnya lebih lama dari satu frame,
+            # buang frame lama di buffer driver agar yang diproses frame terbaru
+            if processing_time > CAMERA_FRAME_INTERVAL:
+                self.camera.grab()
                 
-                # Jika ada orang yang dikenali, update status UI
-                if recognized_people:
-                    for student_id, name in recognized_people:
-                        self.update_attendance_status(student_id, name)
-                
-                # Konversi frame OpenCV ke format yang dapat ditampilkan oleh Tkinter
-                cv2image = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
-                img = Image.fromarray(cv2image)
+            ret = self.camera.grab()
+            if ret:
+                ret, frame = self.camera.retrieve()
+            
+            if not ret:
+                # Sinyal error ke thread UI
+                self._put_latest_frame(None)
+                break
                 
-                # Resize gambar agar sesuai dengan ukuran label
-                width, height = self.camera_label.winfo_width(), self.camera_label.winfo_height()
-                if width > 1 and height > 1:  # Pastikan ukuran valid
-                    img = img.resize((width, height), Image.LANCZOS)
+            # Proses frame untuk pengenalan wajah
+            started = time.monotonic()
+            processed_frame, recognized_people = self.detector.recognize_faces(frame)
+            processing_time = time.monotonic() - started
+            self._put_latest_frame((processed_frame, recognized_people))
+            
+    def _put_latest_frame(self, item):
+        """
+        Simpan frame ke queue dengan membuang frame lama yang belum ditampilkan.
+        
+        Args:
+            item: Tuple (processed_frame, recognized_people) atau None jika error
+        """
+        try:
+            stale = self._frame_q.get_nowait()
+        except queue.Empty:
+            stale = None
+            
+        # Orang yang dikenali pada frame yang dibuang tetap diteruskan ke UI
+        if stale is not None and item is not None and stale[1]:
+            item = (item[0], stale[1] + item[1])
+            
+        self._frame_q.put(item)
+        
+    def update_camera(self):
+        """Menampilkan frame terbaru yang sudah diproses oleh thread capture."""
+        self._camera_job = None
+        if self.is_camera_active and self._camera_view_alive:
+            if self._failed_attendance:
+                self._show_failed_attendance()
                 
-                imgtk = ImageTk.PhotoImage(image=img)
-                self.camera_label.imgtk = imgtk
-                self.camera_label.configure(image=imgtk)
+            try:
+                item = self._frame_q.get_nowait()
+            except queue.Empty:
+                # Belum ada frame baru, coba lagi pada tick berikutnya
+                self._camera_job = self.root.after(33, self.update_camera)
+                return
                 
-                # Schedule next update
-                self.root.after(10, self.update_camera)
-            else:
+            if item is None:
                 # Jika terjadi error, tutup kamera
                 logger.error("Error membaca frame dari kamera")
                 self.close_camera()
+                self.release_camera()
+                return
                 
+            processed_frame, recognized_people = item
+            
+            # Jika ada orang yang dikenali, update status UI
+            if recognized_people:
+                for student_id, name in recognized_people:
+                    self.update_attendance_status(student_id, name)
+            
+            # Resize dengan OpenCV agar sesuai dengan ukuran label (ukuran di-cache dari <Configure>)
+            # Buffer dialokasikan ulang hanya jika ukurannya berubah; resize
+            # dilewati jika label sudah seukuran frame
+            width, height = self._label_size
+            frame_height, frame_width = processed_frame.shape[:2]
+            if width > 1 and height > 1 and (width, height) != (frame_width, frame_height):
+                if self._resize_buf is None or self._resize_buf.shape[:2] != (height, width):
+                    self._resize_buf = np.empty((height, width, 3), dtype=np.uint8)
+                # INTER_AREA untuk memperkecil, INTER_LINEAR untuk memperbesar
+                interpolation = cv2.INTER_AREA if width < frame_width else cv2.INTER_LINEAR
+                cv2.resize(processed_frame, (width, height), dst=self._resize_buf,
+                           interpolation=interpolation)
+                processed_frame = self._resize_buf
+            else:
+                height, width = frame_height, frame_width
+            
+            # Konversi frame OpenCV ke format yang dapat ditampilkan oleh Tkinter
+            if self._rgb_buf is None or self._rgb_buf.shape != processed_frame.shape:
+                self._rgb_buf = np.empty_like(processed_frame)
+            cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            img = Image.frombuffer("RGB", (width, height), self._rgb_buf, "raw", "RGB", 0, 1)
+            
+            # Pakai ulang PhotoImage selama ukurannya tidak berubah
+            if self._imgtk is None or (self._imgtk.width(), self._imgtk.height()) != (width, height):
+                self._imgtk = ImageTk.PhotoImage(image=img)
+                self.camera_label.configure(image=self._imgtk)
+            else:
+                self._imgtk.paste(img)
+            
+            # Schedule next update (~30 FPS, sesuai kecepatan kamera)
+            self._camera_job = self.root.after(33, self.update_camera)
+                
+    def on_camera_label_resized(self, event):
+        """Simpan ukuran label kamera agar tidak perlu query Tk setiap frame."""
+        self._label_size = (event.width, event.height)
+        
     def update_attendance_status(self, student_id, name):
         """
-        Update tampilan status absensi pada UI.
+        Antrekan update status absensi; UI diupdate sekali saat Tk idle.
         
         Args:
             student_id: ID mahasiswa
             name: Nama mahasiswa
         """
-        # Dapatkan data absensi terkini dari database untuk siswa ini
-        data = self.db_handler.get_attendance_data(self.active_class_code, self.active_meeting)
+        # Abaikan update berulang untuk mahasiswa yang sama dalam 1 detik
+        now = time.monotonic()
+        if now - self._last_status_update.get(student_id, 0) < 1.0:
+            return
+        self._last_status_update[student_id] = now
         
+        self._pending_attendance.append((student_id, name))
+        if self._attendance_flush_job is None:
+            self._attendance_flush_job = self.root.after_idle(self._flush_attendance)
+            
+    def _flush_attendance(self):
+        """Terapkan semua update status absensi yang tertunda dalam satu kali redraw."""
+        self._attendance_flush_job = None
+        pending, self._pending_attendance = self._pending_attendance, []
+        if not pending:
+            return
+            
+        # Dapatkan data absensi terkini dari database sekali untuk semua siswa
+        data = self.get_cached_attendance_data(self.active_class_code, self.active_meeting)
+        
+        for student_id, name in pending:
+            status_text, status_color = self.get_attendance_status(data, student_id, name)
+            self.add_to_history(student_id, name)
+        
+        # Update status label dengan status terakhir
+        if self._camera_view_alive:
+            self.attendance_status_label.config(text=status_text, fg=status_color)
+            
+        # Log absensi
+        people = ", ".join(f"{student_id} ({name})" for student_id, name in pending)
+        logger.info(f"Attendance status updated: {people}")
+        
+    def get_cached_attendance_data(self, class_code, meeting):
+        """
+        Ambil data absensi kelas dan pertemuan, memakai cache jika masih baru.
+        
+        Args:
+            class_code: Kode kelas
+            meeting: Nomor pertemuan
+            
+        Returns:
+            list: Data absensi dari database atau cache
+        """
+        key = (class_code, meeting)
+        now = time.monotonic()
+        cached = self._att_cache.get(key)
+        if cached is not None and now - cached[0] < ATTENDANCE_CACHE_TTL:
+            return cached[1]
+            
+        data = self.db_handler.get_attendance_data(class_code, meeting)
+        self._att_cache[key] = (now, data)
+        return data
+        
+    def invalidate_attendance_cache(self, class_code=None, meeting=None):
+        """
+        Buang cache data absensi (dipanggil juga dari thread penulis database).
+        
+        Args:
+            class_code: Kode kelas, None untuk membuang semua entri
+            meeting: Nomor pertemuan
+        """
+        if class_code is None:
+            self._att_cache.clear()
+        else:
+            self._att_cache.pop((class_code, meeting), None)
+            
+    def get_attendance_status(self, data, student_id, name):
+        """
+        Tentukan pesan status absensi untuk seorang mahasiswa.
+        
+        Args:
+            data: List data absensi kelas dan pertemuan aktif
+            student_id: ID mahasiswa
+            name: Nama mahasiswa
+            
+        Returns:
+            tuple: (status_text, status_color)
+        """
         # Filter data untuk siswa yang sesuai
         student_records = [item for item in data if item['nim'] == student_id]
         
@@ -629,9 +928,10 @@ class AttendanceApp:
             latest_record = student_records[-1]
             timestamp = latest_record['timestamp']
             
-            # Format timestamp untuk tampilan
-            formatted_time = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").strftime("%H:%M:%S")
-            formatted_date = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").strftime("%d/%m/%Y")
+            # Format timestamp untuk tampilan; format di database selalu
+            # "%Y-%m-%d %H:%M:%S" sehingga cukup dipotong tanpa strptime
+            formatted_time = timestamp[11:19]
+            formatted_date = f"{timestamp[8:10]}/{timestamp[5:7]}/{timestamp[0:4]}"
             
             # Pesan status untuk siswa yang sudah absen
             status_text = f"{name} ({student_id}) sudah melakukan absensi pada {formatted_date} jam {formatted_time}"
@@ -644,43 +944,125 @@ class AttendanceApp:
             
             status_text = f"Mencatat absensi: {name} ({student_id}) pada {formatted_date} jam {formatted_time}"
             status_color = "#4CAF50"  # Green
+            
+        return status_text, status_color
         
-        # Update status label
-        if hasattr(self, 'attendance_status_label') and self.attendance_status_label.winfo_exists():
-            self.attendance_status_label.config(text=status_text, fg=status_color)
+    def _on_attendance_failed(self, class_code, nim, name, meeting, message):
+        """
+        Catat absensi yang gagal ditulis (dipanggil dari thread penulis database).
+        Ditampilkan oleh update_camera di thread UI.
         
-        # Tambahkan entry status ke history absensi jika ada
-        if hasattr(self, 'attendance_history'):
-            # Cek apakah mahasiswa ini sudah ada di history terbaru
-            student_in_history = False
-            for entry in self.attendance_history[:5]:  # Cek 5 entry terakhir
-                if student_id in entry:
-                    student_in_history = True
-                    break
-            
-            # Jika belum ada di history terbaru, tambahkan
-            if not student_in_history:
-                # Tambahkan entry baru ke awal list (untuk menampilkan yang terbaru di atas)
-                now = datetime.now().strftime("%H:%M:%S")
-                self.attendance_history.insert(0, f"{now} - {name} ({student_id})")
-                
-                # Batasi history ke 10 entry terakhir
-                if len(self.attendance_history) > 10:
-                    self.attendance_history.pop()
+        Args:
+            class_code: Kode kelas
+            nim: ID mahasiswa
+            name: Nama mahasiswa
+            meeting: Nomor pertemuan
+            message: Pesan error database
+        """
+        self.invalidate_attendance_cache(class_code, meeting)
+        self._failed_attendance.append((nim, name, message))
+        
+    def _show_failed_attendance(self):
+        """Tampilkan absensi yang gagal ditulis dan buang mahasiswanya dari history."""
+        failed = []
+        while self._failed_attendance:
+            failed.append(self._failed_attendance.popleft())
+            
+        failed_ids = {nim for nim, _, _ in failed}
+        for nim in failed_ids:
+            # Pengenalan berikutnya akan mencoba mencatat dan menampilkan ulang
+            self._recent_student_ids.pop(nim, None)
+            self._last_status_update.pop(nim, None)
+            
+        # History hanya berisi mahasiswa yang tidak gagal dicatat
+        kept = [entry for entry in self.attendance_history
+                if not any(entry.endswith(f"({nim})") for nim in failed_ids)]
+        if len(kept) != len(self.attendance_history):
+            self.attendance_history.clear()
+            self.attendance_history.extend(kept)
+            if self.sidebar_open:
+                self.history_listbox.delete(0, tk.END)
+                self.history_listbox.insert(tk.END, *self.attendance_history)
+            else:
+                self._history_listbox_stale = True
                 
-                # Update tampilan history jika sidebar terbuka
-                if self.sidebar_open and hasattr(self, 'history_listbox') and self.history_listbox.winfo_exists():
-                    self.history_listbox.delete(0, tk.END)
-                    for entry in self.attendance_history:
-                        self.history_listbox.insert(tk.END, entry)
+        nim, name, message = failed[-1]
+        self.attendance_status_label.config(
+            text=f"Gagal mencatat absensi: {name} ({nim}). Silakan hadap kamera lagi.",
+            fg="#B00020"
+        )
+        logger.error(f"Absensi gagal dicatat: {', '.join(sorted(failed_ids))} ({message})")
         
-        # Log absensi
-        logger.info(f"Attendance status updated: {student_id} ({name})")
+    def add_to_history(self, student_id, name):
+        """
+        Tambahkan entry ke history absensi jika mahasiswa belum ada di history terbaru.
+        Listbox diupdate per entry jika sidebar terbuka.
+        
+        Args:
+            student_id: ID mahasiswa
+            name: Nama mahasiswa
+            
+        Returns:
+            bool: True jika history berubah
+        """
+        # Cek apakah mahasiswa ini sudah ada di 5 entry terakhir
+        if student_id in self._recent_student_ids:
+            return False
+        
+        # Tambahkan entry baru ke depan (untuk menampilkan yang terbaru di atas);
+        # deque membuang entry terlama setelah 10 entry
+        now = datetime.now().strftime("%H:%M:%S")
+        entry = f"{now} - {name} ({student_id})"
+        self.attendance_history.appendleft(entry)
+        
+        self._recent_student_ids[student_id] = None
+        if len(self._recent_student_ids) > 5:
+            self._recent_student_ids.popitem(last=False)
+            
+        # Update listbox hanya sebesar perubahannya
+        if self.sidebar_open and self._camera_view_alive:
+            self.history_listbox.insert(0, entry)
+            if self.history_listbox.size() > self.attendance_history.maxlen:
+                self.history_listbox.delete(tk.END)
+        else:
+            self._history_listbox_stale = True
+            
+        return True
 
         
     def close_camera(self):
-        """Menutup kamera."""
+        """Menghentikan capture kamera; kamera tetap terbuka untuk sesi berikutnya."""
         self.is_camera_active = False
+        
+        # Batalkan penantian model dan update frame yang masih terjadwal
+        if self._detector_wait_job is not None:
+            self.root.after_cancel(self._detector_wait_job)
+            self._detector_wait_job = None
+        if self._camera_job is not None:
+            self.root.after_cancel(self._camera_job)
+            self._camera_job = None
+            
+        # Buang update status yang belum sempat ditampilkan
+        if self._attendance_flush_job is not None:
+            self.root.after_cancel(self._attendance_flush_job)
+            self._attendance_flush_job = None
+        self._pending_attendance = []
+        self._last_status_update.clear()
+        
+        # Tunggu thread capture selesai
+        if self._capture_thread is not None:
+            if self._capture_thread is not threading.current_thread():
+                self._capture_thread.join(timeout=2)
+            self._capture_thread = None
+            
+        # Buang frame yang tersisa dari sesi sebelumnya
+        try:
+            self._frame_q.get_nowait()
+        except queue.Empty:
+            pass
+            
+    def release_camera(self):
+        """Melepas perangkat kamera."""
         if self.camera is not None:
             self.camera.release()
             self.camera = None
@@ -691,70 +1073,119 @@ class AttendanceApp:
         self.close_camera()
         
         # Hapus tampilan absensi
+        self._camera_view_alive = False
         if hasattr(self, 'attendance_frame'):
             self.attendance_frame.destroy()
             
+        # Lepas referensi widget dan buffer frame agar bisa dibebaskan
+        self.camera_label = None
+        self._imgtk = None
+        self._resize_buf = None
+        self._rgb_buf = None
+            
         # Tampilkan kembali tampilan utama
         self.main_frame.pack(fill=tk.BOTH, expand=True)
+        self.update_main_clock(datetime.now())
         
     def sync_data(self):
         """
         Sinkronisasi data absensi yang memiliki status 'pending'.
+        Proses database dijalankan di thread terpisah agar UI tetap responsif.
         """
+        # Cegah sinkronisasi ganda selama proses berjalan
+        self.sync_button.config(state=tk.DISABLED)
+        self._cancel_status_reset()
+        self.status_label.config(text="Sinkronisasi sedang berjalan...", fg=self.text_color)
+        
+        threading.Thread(target=self._do_sync, daemon=True).start()
+        
+    def _do_sync(self):
+        """Menjalankan sinkronisasi database di background thread."""
         # Untuk prototype, kita hanya akan mengubah status semua record menjadi 'success'
         # Di implementasi nyata, di sini akan ada kode untuk sinkronisasi dengan server
         
         try:
-            # Dapatkan semua kelas yang ada di classes.json
-            class_codes = [cls["class_code"] for cls in self.classes_data["classes"]]
+            # Ambil semua record 'pending' untuk kelas di classes.json dalam satu query
+            pending = self.db_handler.get_all_pending_ids(self._class_codes)
             
+            # Update status menjadi 'success' dalam satu transaksi
             total_updated = 0
-            
-            for class_code in class_codes:
-                # Ambil semua data absensi untuk kelas
-                data = self.db_handler.get_attendance_data(class_code)
-                
-                # Filter record dengan status 'pending'
-                pending_ids = [item['id'] for item in data if item['status'] == 'pending']
-                
-                if pending_ids:
-                    # Update status menjadi 'success'
-                    self.db_handler.update_attendance_status(class_code, pending_ids, 'success')
-                    total_updated += len(pending_ids)
-            
-            # Tampilkan pesan status
-            if total_updated > 0:
-                self.status_label.config(
-                    text=f"Sinkronisasi selesai: {total_updated} record berhasil disinkronkan",
-                    fg="green"
-                )
-            else:
-                self.status_label.config(
-                    text="Tidak ada data baru untuk disinkronkan",
-                    fg=self.text_color
-                )
+            if pending:
+                if not self.db_handler.bulk_update_status(pending, 'success'):
+                    raise RuntimeError("Gagal mengupdate status absensi")
+                total_updated = sum(len(ids) for ids in pending.values())
                 
-            # Reset pesan setelah beberapa detik
-            self.root.after(5000, lambda: self.status_label.config(
-                text="Siap untuk absensi",
-                fg=self.text_color
-            ))
+            self.root.after(0, self._on_sync_done, total_updated, None)
             
         except Exception as e:
             logger.error(f"Error saat sinkronisasi data: {str(e)}")
+            self.root.after(0, self._on_sync_done, 0, e)
+            
+    def _on_sync_done(self, total_updated, error):
+        """
+        Update UI setelah sinkronisasi selesai (dijalankan di thread UI).
+        
+        Args:
+            total_updated: Jumlah record yang berhasil disinkronkan
+            error: Exception jika sinkronisasi gagal, None jika berhasil
+        """
+        self.sync_button.config(state=tk.NORMAL)
+        
+        # Status absensi berubah setelah sinkronisasi
+        self.invalidate_attendance_cache()
+        
+        if error is not None:
             self.status_label.config(
-                text=f"Error saat sinkronisasi: {str(e)}",
+                text=f"Error saat sinkronisasi: {str(error)}",
                 fg="red"
             )
-        
+            return
+            
+        # Tampilkan pesan status
+        if total_updated > 0:
+            self.status_label.config(
+                text=f"Sinkronisasi selesai: {total_updated} record berhasil disinkronkan",
+                fg="green"
+            )
+        else:
+            self.status_label.config(
+                text="Tidak ada data baru untuk disinkronkan",
+                fg=self.text_color
+            )
+            
+        # Reset pesan setelah beberapa detik
+        self._cancel_status_reset()
+        self._status_reset_job = self.root.after(5000, self._reset_status_label)
+        
+    def _reset_status_label(self):
+        """Kembalikan pesan status ke pesan default."""
+        self._status_reset_job = None
+        self.status_label.config(text="Siap untuk absensi", fg=self.text_color)
+        
+    def _cancel_status_reset(self):
+        """Batalkan reset pesan status yang masih terjadwal."""
+        if self._status_reset_job is not None:
+            self.root.after_cancel(self._status_reset_job)
+            self._status_reset_job = None
+            
     def on_closing(self):
         """Handler saat aplikasi ditutup."""
         if messagebox.askokcancel("Keluar", "Apakah Anda yakin ingin keluar?"):
             # Tutup kamera jika masih aktif
             self.close_camera()
+            self.release_camera()
+            
+            # Hentikan timer jam
+            if self._clock_job is not None:
+                self.root.after_cancel(self._clock_job)
+                self._clock_job = None
+            
+            # Tutup koneksi database persisten
+            self.db_handler.close()
             
             # Tutup aplikasi
             self.root.destroy()
+            log_listener.stop()
             sys.exit(0)
 
 def main():
@@ -7,38 +7,44 @@ Digunakan untuk keperluan debugging dan administrasi sistem.
 """
 
 import os
+import re
 import sys
+import csv
+import atexit
 import argparse
 import logging
 import sqlite3
-import json
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from tabulate import tabulate  # Perlu menginstal: pip install tabulate
 
-# Impor database_handler dari direktori src
-sys.path.append('src')
+# Gunakan orjson (parser C) jika tersedia, fallback ke json bawaan
 try:
-    from database_handler import DatabaseHandler
+    import orjson as _json
 except ImportError:
-    sys.path.append('.')
-    try:
-        from database_handler import DatabaseHandler
-    except ImportError:
-        print("Error: Tidak dapat mengimpor modul database_handler")
-        sys.exit(1)
+    import json as _json
+
+# Direktori logs harus ada sebelum FileHandler dibuat
+os.makedirs('logs', exist_ok=True)
 
-# Konfigurasi logging
+# Konfigurasi logging; file log baru dibuka saat record pertama ditulis
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('logs/checkdb.log'),
+        logging.FileHandler('logs/checkdb.log', delay=True),
         logging.StreamHandler()
     ]
 )
 
 logger = logging.getLogger(__name__)
 
+# Nama tabel absensi yang aman disisipkan ke teks SQL
+TABLE_NAME_RE = re.compile(r"^attendance_[A-Za-z0-9_]+$")
+
+# Batas SELECT per query UNION ALL (SQLITE_MAX_COMPOUND_SELECT bawaan SQLite)
+SUMMARY_CHUNK_SIZE = 500
+
 class DatabaseChecker:
     def __init__(self, db_path="database/attendance.db"):
         """
@@ -47,18 +53,45 @@ class DatabaseChecker:
         Args:
             db_path (str): Path ke file database SQLite
         """
-        # Pastikan direktori logs ada
-        os.makedirs('logs', exist_ok=True)
-        
-        # Inisialisasi database handler
-        self.db_handler = DatabaseHandler(db_path)
+        # Buat direktori database jika belum ada
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
         self.db_path = db_path
         
+        # Satu koneksi dipakai ulang untuk semua query checker
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA cache_size=-32000;
+            PRAGMA temp_store=MEMORY;
+        """)
+        
         # Load konfigurasi kelas
         self.classes_data = self.load_classes_data()
         
+        # SQL per tabel dibangun sekali; teks SQL yang sama memakai ulang
+        # prepared statement dari cache koneksi sqlite3
+        self._select_sql = {}
+        self._select_meeting_sql = {}
+        self._meetings_sql = {}
+        self._summary_sql = ((), [])
+        
+        # Cache nama tabel absensi, diperbarui setiap get_all_tables()
+        self._table_set = set(self.get_all_tables())
+        
         logger.info(f"Database Checker diinisialisasi dengan database di {db_path}")
     
+    def close(self):
+        """Menutup koneksi database bersama."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+    
+    def __del__(self):
+        if getattr(self, 'conn', None) is not None:
+            self.close()
+    
     def load_classes_data(self):
         """
         Memuat data kelas dari file classes.json.
@@ -67,13 +100,16 @@ class DatabaseChecker:
             dict: Data kelas atau dictionary kosong jika terjadi error
         """
         try:
-            with open('classes.json', 'r') as f:
-                data = json.load(f)
+            with open('classes.json', 'rb') as f:
+                data = _json.loads(f.read())
                 logger.info(f"Berhasil memuat {len(data['classes'])} kelas dari classes.json")
-                return data
         except Exception as e:
             logger.error(f"Error saat memuat data kelas: {str(e)}")
-            return {"classes": []}
+            data = {"classes": []}
+            
+        # Index nama kelas berdasarkan kode untuk lookup O(1)
+        self.class_name_by_code = {cls["class_code"]: cls["class_name"] for cls in data["classes"]}
+        return data
     
     def get_all_tables(self):
         """
@@ -83,27 +119,68 @@ class DatabaseChecker:
             list: Daftar nama tabel
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Query untuk mendapatkan semua tabel
-            cursor.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name LIKE 'attendance_%'
-                ORDER BY name
-            """)
-            
-            tables = [row[0] for row in cursor.fetchall()]
-            conn.close()
+            with closing(self.conn.cursor()) as cursor:
+                # Query untuk mendapatkan semua tabel
+                cursor.execute("""
+                    SELECT name FROM sqlite_master 
+                    WHERE type='table' AND name LIKE 'attendance_%'
+                    ORDER BY name
+                """)
+                
+                tables = [row[0] for row in cursor.fetchall()]
+                
+            self._table_set = set(tables)
+            self._build_table_sql(tables)
             
             logger.info(f"Menemukan {len(tables)} tabel absensi dalam database")
             return tables
         except sqlite3.Error as e:
             logger.error(f"Error saat mendapatkan daftar tabel: {str(e)}")
-            if 'conn' in locals() and conn:
-                conn.close()
             return []
     
+    def _build_table_sql(self, tables):
+        """
+        Membangun query SELECT untuk setiap tabel yang belum punya query.
+        
+        Args:
+            tables (list): Daftar nama tabel
+        """
+        for table_name in tables:
+            if table_name in self._select_sql:
+                continue
+            if not TABLE_NAME_RE.match(table_name):
+                logger.warning(f"Nama tabel tidak valid, dilewati: {table_name}")
+                continue
+            self._select_sql[table_name] = f"""
+                SELECT id, nim, name, meeting, timestamp, status
+                FROM {table_name}
+                ORDER BY meeting, timestamp
+            """
+            self._select_meeting_sql[table_name] = f"""
+                SELECT id, nim, name, meeting, timestamp, status
+                FROM {table_name}
+                WHERE meeting = ?
+                ORDER BY timestamp
+            """
+            self._meetings_sql[table_name] = f"SELECT DISTINCT meeting FROM {table_name} ORDER BY 1"
+    
+    def get_select_sql(self, table_name):
+        """
+        Mendapatkan query SELECT yang sudah dibangun untuk tabel tertentu.
+        
+        Args:
+            table_name (str): Nama tabel
+            
+        Returns:
+            str: Query SQL atau None jika tabel tidak dikenal
+        """
+        sql = self._select_sql.get(table_name)
+        if sql is None:
+            # Tabel mungkin baru dibuat; muat ulang daftar tabel
+            self.get_all_tables()
+            sql = self._select_sql.get(table_name)
+        return sql
+    
     def get_class_code_from_table(self, table_name):
         """
         Mengekstrak kode kelas dari nama tabel.
@@ -128,10 +205,7 @@ class DatabaseChecker:
         Returns:
             str: Nama kelas atau kode kelas jika tidak ditemukan
         """
-        for cls in self.classes_data.get("classes", []):
-            if cls.get("class_code") == class_code:
-                return cls.get("class_name")
-        return class_code
+        return self.class_name_by_code.get(class_code, class_code)
     
     def check_table_exists(self, class_code):
         """
@@ -144,53 +218,65 @@ class DatabaseChecker:
             bool: True jika tabel ada, False jika tidak
         """
         table_name = f"attendance_{class_code}"
+        if table_name in self._table_set:
+            return True
         
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name=?
-            """, (table_name,))
-            
-            result = cursor.fetchone() is not None
-            conn.close()
+        # Tabel bisa saja baru dibuat oleh aplikasi absensi; muat ulang daftar tabel
+        return table_name in set(self.get_all_tables())
+    
+    def get_meetings(self, table_name):
+        """
+        Mendapatkan daftar nomor pertemuan yang ada di tabel tertentu.
+        
+        Args:
+            table_name (str): Nama tabel
             
-            return result
+        Returns:
+            list: Nomor pertemuan, terurut
+        """
+        if self.get_select_sql(table_name) is None:
+            logger.error(f"Tabel tidak ditemukan: {table_name}")
+            return []
+        
+        try:
+            with closing(self.conn.cursor()) as cursor:
+                cursor.execute(self._meetings_sql[table_name])
+                return [row[0] for row in cursor.fetchall()]
         except sqlite3.Error as e:
-            logger.error(f"Error saat memeriksa keberadaan tabel: {str(e)}")
-            if 'conn' in locals() and conn:
-                conn.close()
-            return False
+            logger.error(f"Error saat membaca pertemuan dari tabel {table_name}: {str(e)}")
+            return []
     
-    def get_table_data(self, table_name):
+    def get_table_data(self, table_name, meeting=None):
         """
-        Mendapatkan semua data dari tabel tertentu.
+        Mendapatkan data dari tabel tertentu.
         
         Args:
             table_name (str): Nama tabel
+            meeting (int, optional): Nomor pertemuan. Jika None, ambil semua pertemuan.
             
         Returns:
             list: Daftar dictionary yang berisi data
         """
+        sql = self.get_select_sql(table_name)
+        if sql is None:
+            logger.error(f"Tabel tidak ditemukan: {table_name}")
+            return []
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Mengubah row factory untuk mendapatkan hasil sebagai dictionary
-            cursor = conn.cursor()
-            
-            cursor.execute(f"SELECT * FROM {table_name} ORDER BY meeting, timestamp")
-            
-            # Konversi hasil ke list of dict
-            result = [dict(row) for row in cursor.fetchall()]
+            # row_factory sqlite3.Row diset di __init__
+            with closing(self.conn.cursor()) as cursor:
+                if meeting is None:
+                    cursor.execute(sql)
+                else:
+                    cursor.execute(self._select_meeting_sql[table_name], (meeting,))
+                
+                # Konversi hasil ke list of dict
+                result = [dict(row) for row in cursor.fetchall()]
             
-            conn.close()
             logger.info(f"Berhasil membaca {len(result)} baris data dari tabel {table_name}")
             return result
         except sqlite3.Error as e:
             logger.error(f"Error saat membaca data dari tabel {table_name}: {str(e)}")
-            if 'conn' in locals() and conn:
-                conn.close()
             return []
     
     def get_database_summary(self):
@@ -200,44 +286,96 @@ class DatabaseChecker:
         Returns:
             dict: Ringkasan database dengan informasi tabel dan jumlah data
         """
-        tables = self.get_all_tables()
+        tables = [table_name for table_name in self.get_all_tables() if table_name in self._select_sql]
         summary = []
+        if not tables:
+            return summary
+        
+        # Hitung jumlah record, pertemuan unik, dan mahasiswa unik dengan satu
+        # query UNION ALL per kelompok tabel (maksimal SUMMARY_CHUNK_SIZE SELECT)
+        if tuple(tables) != self._summary_sql[0]:
+            queries = []
+            for start in range(0, len(tables), SUMMARY_CHUNK_SIZE):
+                chunk = tables[start:start + SUMMARY_CHUNK_SIZE]
+                query = " UNION ALL ".join(
+                    f"SELECT ?, COUNT(*), COUNT(DISTINCT meeting), COUNT(DISTINCT nim) FROM {table_name}"
+                    for table_name in chunk
+                )
+                queries.append((chunk, query))
+            self._summary_sql = (tuple(tables), queries)
+        
+        counts = {}
+        try:
+            with closing(self.conn.cursor()) as cursor:
+                for chunk, query in self._summary_sql[1]:
+                    cursor.execute(query, chunk)
+                    counts.update((row[0], tuple(row[1:])) for row in cursor.fetchall())
+        except sqlite3.Error as e:
+            logger.error(f"Error saat mendapatkan ringkasan database: {str(e)}")
+            return summary
         
         for table_name in tables:
             class_code = self.get_class_code_from_table(table_name)
-            class_name = self.get_class_name(class_code)
-            
-            # Hitung jumlah record
-            try:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                count = cursor.fetchone()[0]
-                
-                # Hitung jumlah pertemuan unik
-                cursor.execute(f"SELECT COUNT(DISTINCT meeting) FROM {table_name}")
-                meetings = cursor.fetchone()[0]
+            count, meetings, students = counts[table_name]
+            
+            summary.append({
+                "table_name": table_name,
+                "class_code": class_code,
+                "class_name": self.get_class_name(class_code),
+                "records": count,
+                "meetings": meetings,
+                "students": students
+            })
+        
+        return summary
+    
+    def export_table_to_csv(self, class_code, export_dir="exports", conn=None):
+        """
+        Mengekspor data satu kelas ke file CSV secara streaming.
+        
+        Baris dibaca per batch dengan fetchmany dan langsung ditulis ke file,
+        sehingga memori tetap konstan berapa pun ukuran tabel.
+        
+        Args:
+            class_code (str): Kode kelas
+            export_dir (str): Direktori untuk menyimpan file CSV
+            conn (sqlite3.Connection, optional): Koneksi yang dipakai; default koneksi bersama
+            
+        Returns:
+            tuple: (success, filepath)
+        """
+        sql = self._select_sql.get(f"attendance_{class_code}")
+        if sql is None:
+            logger.error(f"Tabel untuk kelas {class_code} tidak ditemukan")
+            return False, None
+        
+        try:
+            # Cursor khusus agar export tidak terganggu query lain
+            with closing((conn or self.conn).cursor()) as cursor:
+                cursor.execute(sql)
                 
-                # Hitung jumlah mahasiswa unik
-                cursor.execute(f"SELECT COUNT(DISTINCT nim) FROM {table_name}")
-                students = cursor.fetchone()[0]
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    logger.warning(f"Tidak ada data untuk diekspor - Kelas {class_code}")
+                    return False, None
                 
-                conn.close()
+                os.makedirs(export_dir, exist_ok=True)
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                filepath = f"{export_dir}/attendance_{class_code}_{timestamp}.csv"
                 
-                summary.append({
-                    "table_name": table_name,
-                    "class_code": class_code,
-                    "class_name": class_name,
-                    "records": count,
-                    "meetings": meetings,
-                    "students": students
-                })
-            except sqlite3.Error as e:
-                logger.error(f"Error saat mendapatkan ringkasan untuk {table_name}: {str(e)}")
-                if 'conn' in locals() and conn:
-                    conn.close()
-        
-        return summary
+                with open(filepath, 'w', newline='') as csvfile:
+                    writer = csv.writer(csvfile)
+                    writer.writerow([column[0] for column in cursor.description])
+                    
+                    while rows:
+                        writer.writerows(rows)
+                        rows = cursor.fetchmany(1000)
+            
+            logger.info(f"Data berhasil diekspor ke {filepath}")
+            return True, filepath
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Error saat mengekspor data kelas {class_code}: {str(e)}")
+            return False, None
     
     def export_all_data_to_csv(self, export_dir="exports"):
         """
@@ -251,17 +389,82 @@ class DatabaseChecker:
         """
         os.makedirs(export_dir, exist_ok=True)
         
-        tables = self.get_all_tables()
-        exported_files = []
-        
-        for table_name in tables:
-            class_code = self.get_class_code_from_table(table_name)
-            if class_code:
-                success, filepath = self.db_handler.export_attendance_to_csv(class_code)
-                if success and filepath:
-                    exported_files.append(filepath)
+        class_codes = [self.get_class_code_from_table(table_name) for table_name in self.get_all_tables()]
+        class_codes = [class_code for class_code in class_codes if class_code]
+        if not class_codes:
+            return []
         
-        return exported_files
+        # Ekspor tiap tabel paralel; file tujuan berbeda dan mode WAL
+        # mengizinkan banyak pembaca sekaligus
+        with ThreadPoolExecutor(max_workers=min(8, len(class_codes))) as executor:
+            results = executor.map(lambda class_code: self._export_one(class_code, export_dir), class_codes)
+            return [filepath for success, filepath in results if success and filepath]
+    
+    def _export_one(self, class_code, export_dir):
+        """Ekspor satu kelas di thread worker dengan koneksi SQLite sendiri."""
+        try:
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                return self.export_table_to_csv(class_code, export_dir, conn)
+        except sqlite3.Error as e:
+            logger.error(f"Error saat membuat koneksi untuk ekspor {class_code}: {str(e)}")
+            return False, None
+
+
+# Teks menu utama, dibangun sekali dan ditulis ke stdout dalam satu panggilan
+MENU_TEXT = "\n".join([
+    "",
+    "=" * 60,
+    " PROGRAM PEMERIKSAAN DATABASE ABSENSI ".center(60, "="),
+    "=" * 60,
+    "",
+    "Menu:",
+    "1. Tampilkan ringkasan database",
+    "2. Tampilkan data kelas tertentu",
+    "3. Ekspor semua data ke CSV",
+    "4. Ekspor data kelas tertentu ke CSV",
+    "0. Keluar",
+    "",
+    "",
+])
+
+
+def print_exported_files(exported_files, prefix=""):
+    """
+    Menampilkan daftar file hasil ekspor dengan satu kali tulis ke stdout.
+    
+    Args:
+        exported_files (list): Daftar path file
+        prefix (str): Teks sebelum baris pertama (misalnya baris kosong)
+    """
+    lines = [f"{prefix}Berhasil mengekspor data ke {len(exported_files)} file:"]
+    lines.extend(f" - {filepath}" for filepath in exported_files)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def fast_grid(rows, headers, title=None):
+    """
+    Menampilkan baris data sebagai tabel grid dengan satu kali tulis ke stdout.
+    
+    Lebar kolom dihitung sekali dari semua sel yang sudah dikonversi ke str.
+    
+    Args:
+        rows (list): Daftar baris (list/tuple nilai sel)
+        headers (list): Header kolom
+        title (str, optional): Judul yang ditulis di atas tabel
+    """
+    headers = [str(header) for header in headers]
+    rows = [[str(cell) for cell in row] for row in rows]
+    widths = [max(map(len, column)) for column in zip(headers, *rows)]
+    
+    fmt = "| " + " | ".join("{:<%d}" % width for width in widths) + " |"
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+    header_border = border.replace("-", "=")
+    
+    lines = [] if title is None else [title]
+    lines += [border, fmt.format(*headers), header_border]
+    lines.extend(fmt.format(*row) for row in rows)
+    lines.append(border)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def print_table(data, headers=None):
@@ -279,7 +482,8 @@ def print_table(data, headers=None):
     if not headers and data:
         headers = list(data[0].keys())
     
-    print(tabulate(data, headers=headers, tablefmt="grid"))
+    rows = [list(item.values()) if isinstance(item, dict) else item for item in data]
+    fast_grid(rows, headers)
 
 
 def main():
@@ -289,33 +493,22 @@ def main():
     parser.add_argument("--export", action="store_true", help="Ekspor semua data ke CSV")
     args = parser.parse_args()
     
-    # Buat direktori logs jika belum ada
-    os.makedirs("logs", exist_ok=True)
-    
     # Inisialisasi database checker
     checker = DatabaseChecker(args.db)
+    atexit.register(checker.close)
     
     # Ekspor data jika diminta
     if args.export:
         exported_files = checker.export_all_data_to_csv()
         if exported_files:
-            print(f"Berhasil mengekspor data ke {len(exported_files)} file:")
-            for filepath in exported_files:
-                print(f" - {filepath}")
+            print_exported_files(exported_files)
         else:
             print("Tidak ada data yang diekspor.")
         return
     
     while True:
-        print("\n" + "="*60)
-        print(" PROGRAM PEMERIKSAAN DATABASE ABSENSI ".center(60, "="))
-        print("="*60)
-        print("\nMenu:")
-        print("1. Tampilkan ringkasan database")
-        print("2. Tampilkan data kelas tertentu")
-        print("3. Ekspor semua data ke CSV")
-        print("4. Ekspor data kelas tertentu ke CSV")
-        print("0. Keluar\n")
+        sys.stdout.write(MENU_TEXT)
+        sys.stdout.flush()
         
         choice = input("Pilihan Anda [0-4]: ")
         
@@ -325,11 +518,10 @@ def main():
             
         elif choice == "1":
             # Tampilkan ringkasan database
-            print("\nRINGKASAN DATABASE:")
             summary = checker.get_database_summary()
             
             if not summary:
-                print("Tidak ada tabel absensi dalam database.")
+                print("\nRINGKASAN DATABASE:\nTidak ada tabel absensi dalam database.")
             else:
                 summary_data = []
                 for item in summary:
@@ -342,7 +534,7 @@ def main():
                     ])
                 
                 headers = ["Kode Kelas", "Nama Kelas", "Total Record", "Jumlah Pertemuan", "Jumlah Mahasiswa"]
-                print(tabulate(summary_data, headers=headers, tablefmt="grid"))
+                fast_grid(summary_data, headers, title="\nRINGKASAN DATABASE:")
             
         elif choice == "2":
             # Tampilkan data kelas tertentu
@@ -357,25 +549,29 @@ def main():
                 continue
             
             table_name = f"attendance_{class_code}"
-            data = checker.get_table_data(table_name)
             
-            if not data:
+            # Ambil daftar pertemuan (DISTINCT, terurut oleh SQLite) sebelum
+            # memuat baris data, agar filter pertemuan dijalankan di SQL
+            meetings = checker.get_meetings(table_name)
+            
+            if not meetings:
                 print(f"Tidak ada data absensi untuk kelas {class_code}.")
                 continue
             
             # Tampilkan filter pertemuan jika ada beberapa pertemuan
-            meetings = set(item["meeting"] for item in data)
+            meeting_filter = None
             if len(meetings) > 1:
-                print(f"\nPertemuan yang tersedia: {', '.join(map(str, sorted(meetings)))}")
-                meeting_filter = input("Masukkan nomor pertemuan (kosongkan untuk semua): ")
+                print(f"\nPertemuan yang tersedia: {', '.join(map(str, meetings))}")
+                meeting_input = input("Masukkan nomor pertemuan (kosongkan untuk semua): ")
                 
-                if meeting_filter:
+                if meeting_input:
                     try:
-                        meeting_filter = int(meeting_filter)
-                        data = [item for item in data if item["meeting"] == meeting_filter]
+                        meeting_filter = int(meeting_input)
                     except ValueError:
                         print("Nomor pertemuan harus berupa angka.")
             
+            data = checker.get_table_data(table_name, meeting_filter)
+            
             # Menyiapkan data untuk ditampilkan
             display_data = []
             for item in data:
@@ -389,17 +585,14 @@ def main():
                 ])
             
             headers = ["ID", "NIM", "Nama", "Pertemuan", "Waktu", "Status"]
-            print(f"\nData Absensi untuk Kelas {class_code}:")
-            print(tabulate(display_data, headers=headers, tablefmt="grid"))
+            fast_grid(display_data, headers, title=f"\nData Absensi untuk Kelas {class_code}:")
             
         elif choice == "3":
             # Ekspor semua data ke CSV
             exported_files = checker.export_all_data_to_csv()
             
             if exported_files:
-                print(f"\nBerhasil mengekspor data ke {len(exported_files)} file:")
-                for filepath in exported_files:
-                    print(f" - {filepath}")
+                print_exported_files(exported_files, prefix="\n")
             else:
                 print("\nTidak ada data yang diekspor.")
             
@@ -415,11 +608,10 @@ def main():
                 print(f"Tabel untuk kelas {class_code} tidak ditemukan dalam database.")
                 continue
             
-            success, filepath = checker.db_handler.export_attendance_to_csv(class_code)
+            success, filepath = checker.export_table_to_csv(class_code)
             
             if success and filepath:
-                print(f"\nBerhasil mengekspor data kelas {class_code} ke:")
-                print(f" - {filepath}")
+                print(f"\nBerhasil mengekspor data kelas {class_code} ke:\n - {filepath}")
             else:
                 print(f"\nGagal mengekspor data kelas {class_code}.")
         
@@ -7,24 +7,145 @@ Tampilan utama sistem absensi dengan PyQt5.
 
 import sys
 import os
-from datetime import datetime
+import time
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QLabel, QPushButton, 
                             QWidget, QVBoxLayout, QHBoxLayout, QFrame, 
-                            QGridLayout, QSizePolicy)
-from PyQt5.QtCore import Qt, QTimer, QSize, QPropertyAnimation, QRect
-from PyQt5.QtGui import QFont, QPixmap, QIcon, QPalette, QBrush, QColor
+                            QSizePolicy)
+from PyQt5.QtCore import (Qt, QTimer, QSize, QPropertyAnimation, QPoint, QObject,
+                          QRunnable, QThreadPool, pyqtSignal)
+from PyQt5.QtGui import QFont, QPixmap, QImage, QIcon, QPalette, QBrush, QColor
+
+# Application-wide stylesheet, parsed once and applied on the QApplication
+APP_QSS = """
+    QWidget#centralWidget[background="solid"] {
+        background-color: #1e272e;
+    }
+    QWidget#centralWidget[background="gradient"] {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                                    stop:0 #2c3e50, stop:1 #3498db);
+    }
+    QWidget#topBar {
+        background-color: rgba(0, 0, 0, 50%);
+    }
+    QPushButton#drawerToggleBtn {
+        background-color: transparent;
+        border: none;
+        color: white;
+    }
+    QPushButton#drawerToggleBtn:hover {
+        background-color: rgba(255, 255, 255, 20%);
+    }
+    QLabel#timeLabel {
+        color: white;
+        font-size: 32px;
+        font-weight: bold;
+    }
+    QLabel#dateLabel {
+        color: white;
+        font-size: 16px;
+    }
+    QPushButton#loginBtn {
+        background-color: #3498db;
+        color: white;
+        border: none;
+        border-radius: 5px;
+        padding: 8px 15px;
+        font-size: 14px;
+        font-weight: bold;
+    }
+    QPushButton#loginBtn:hover {
+        background-color: #2980b9;
+    }
+    QPushButton#loginBtn:pressed {
+        background-color: #1c6ea4;
+    }
+    QWidget#drawer {
+        background-color: rgba(44, 62, 80, 95%);
+        border-right: 1px solid rgba(255, 255, 255, 30%);
+    }
+    QFrame#userBox {
+        background-color: rgba(255, 255, 255, 10%);
+        border-radius: 10px;
+        padding: 10px;
+    }
+    QLabel#usernameLabel {
+        color: white;
+        font-size: 16px;
+        font-weight: bold;
+    }
+    QLabel#userIdLabel {
+        color: rgba(255, 255, 255, 70%);
+        font-size: 14px;
+    }
+    QFrame#separator {
+        background-color: rgba(255, 255, 255, 20%);
+    }
+    QPushButton#menuButton {
+        background-color: rgba(255, 255, 255, 10%);
+        color: white;
+        border: none;
+        border-radius: 5px;
+        padding: 10px;
+        text-align: left;
+        font-size: 16px;
+    }
+    QPushButton#menuButton:hover {
+        background-color: rgba(255, 255, 255, 20%);
+    }
+    QPushButton#menuButton:pressed {
+        background-color: rgba(255, 255, 255, 30%);
+    }
+"""
+
+# Asset caches, filled lazily (Qt pixmaps need a running QApplication)
+_ICON_CACHE = {}
+_PIXMAP_CACHE = {}
+
+def _icon(path):
+    """Return a cached QIcon for the given asset path."""
+    icon = _ICON_CACHE.get(path)
+    if icon is None:
+        icon = QIcon(path)
+        _ICON_CACHE[path] = icon
+    return icon
+
+def _pixmap(path, size):
+    """Return a cached QPixmap of the given asset scaled to fit size x size."""
+    key = (path, size)
+    pixmap = _PIXMAP_CACHE.get(key)
+    if pixmap is None:
+        pixmap = QPixmap(path).scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        _PIXMAP_CACHE[key] = pixmap
+    return pixmap
+
+class _ImageLoaderSignals(QObject):
+    """Signals for _ImageLoader (QRunnable itself cannot emit signals)."""
+    loaded = pyqtSignal(QImage)
+
+class _ImageLoader(QRunnable):
+    """Decode an image file on a QThreadPool worker thread."""
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.signals = _ImageLoaderSignals()
+        
+    def run(self):
+        # QImage is safe to build off the GUI thread; QPixmap is not.
+        # The signal is delivered to the GUI thread as a queued connection.
+        self.signals.loaded.emit(QImage(self.path))
 
 class AttendanceSystemUI(QMainWindow):
     def __init__(self):
         super().__init__()
         
-        # Setup UI
-        self.init_ui()
-        
-        # Start timer for clock update
+        # Single-shot timer for clock update, re-armed at each full second
         self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.update_clock)
-        self.timer.start(1000)  # Update every second
+        self._last_yday = None  # (year, day of year) currently shown in date_label
+        
+        # Setup UI (also performs the first clock update)
+        self.init_ui()
         
         # Drawer state
         self.drawer_open = False
@@ -37,10 +158,10 @@ class AttendanceSystemUI(QMainWindow):
         
         # Create main widget and layout
         self.central_widget = QWidget()
+        self.central_widget.setObjectName("centralWidget")
         self.setCentralWidget(self.central_widget)
-        self.main_layout = QGridLayout(self.central_widget)
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-        self.main_layout.setSpacing(0)
+        # No layout on the central widget: background, top bar and drawer are
+        # placed manually in resizeEvent
         
         # Set background image
         self.set_background()
@@ -56,72 +177,86 @@ class AttendanceSystemUI(QMainWindow):
         # Check if background image exists
         bg_path = "assets/background.jpg"
         if os.path.exists(bg_path):
-            try:
-                # Create a full-screen background label
-                self.bg_label = QLabel(self.central_widget)
-                self.bg_label.setMinimumSize(1, 1)
-                self.bg_label.lower()  # Send to back
-                
-                # Load pixmap
-                self.bg_pixmap = QPixmap(bg_path)
-                if not self.bg_pixmap.isNull():
-                    # Set to fill entire window
-                    self.bg_label.setScaledContents(True)  # Stretch to fill
-                    self.resize_background()  # Initial sizing
-                else:
-                    raise Exception("Failed to load background image")
-            except Exception as e:
-                print(f"Error setting background with QLabel: {e}")
-                # Fallback to a solid color background
-                self.central_widget.setStyleSheet("""
-                    background-color: #1e272e;
-                """)
+            # Solid color placeholder until the image is decoded (also the
+            # fallback if decoding fails)
+            self.set_background_style("solid")
+            
+            # Create a full-screen background label
+            self.bg_label = QLabel(self.central_widget)
+            self.bg_label.setMinimumSize(1, 1)
+            self.bg_label.lower()  # Send to back
+            
+            # Pre-scaled copy of the pixmap, rescaled only when the size changes
+            self._bg_key = None
+            self._bg_scaled = None
+            self.bg_label.setScaledContents(False)
+            self.bg_label.setAlignment(Qt.AlignCenter)
+            
+            # Coalesce bursts of resize events into one rescale
+            self._bg_resize_timer = QTimer(self)
+            self._bg_resize_timer.setSingleShot(True)
+            self._bg_resize_timer.timeout.connect(self.resize_background)
+            
+            # Decode the JPEG off the UI thread
+            self._bg_loader = _ImageLoader(bg_path)
+            self._bg_loader.signals.loaded.connect(self.on_background_loaded)
+            QThreadPool.globalInstance().start(self._bg_loader)
         else:
             # Fallback to a gradient background if image doesn't exist
-            self.central_widget.setStyleSheet("""
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                                          stop:0 #2c3e50, stop:1 #3498db);
-            """)
+            self.set_background_style("gradient")
             print(f"Warning: Background image not found at {bg_path}")
             
+    def set_background_style(self, name):
+        """Select a fallback background rule from APP_QSS for the central widget"""
+        self.central_widget.setProperty("background", name)
+        
+        # Dynamic properties only take effect after the style is re-polished
+        self.central_widget.style().unpolish(self.central_widget)
+        self.central_widget.style().polish(self.central_widget)
+        
+    def on_background_loaded(self, image):
+        """Receive the decoded background image on the UI thread"""
+        self._bg_loader = None
+        if image.isNull():
+            print("Error setting background with QLabel: Failed to load background image")
+            return
+            
+        self.bg_pixmap = QPixmap.fromImage(image)
+        self.resize_background()  # Initial sizing
+        
+
     def resize_background(self):
         """Resize background image to fill the entire window"""
         if hasattr(self, 'bg_label'):
             # Make the background label fill the entire central widget
             self.bg_label.setGeometry(0, 0, self.width(), self.height())
             
-            # If we have a pixmap, update it
+            # If we have a pixmap, rescale it only when the window size changed
             if hasattr(self, 'bg_pixmap') and not self.bg_pixmap.isNull():
-                self.bg_label.setPixmap(self.bg_pixmap)
+                key = (self.width(), self.height())
+                if key != self._bg_key:
+                    self._bg_scaled = self.bg_pixmap.scaled(
+                        *key, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation
+                    )
+                    self._bg_key = key
+                    self.bg_label.setPixmap(self._bg_scaled)
             
     def create_top_bar(self):
         """Create the top bar with clock and login button"""
         # Top bar container
-        self.top_bar = QWidget()
-        self.top_bar.setMinimumHeight(80)
-        self.top_bar.setMaximumHeight(80)
-        self.top_bar.setStyleSheet("""
-            background-color: rgba(0, 0, 0, 50%);
-        """)
+        self.top_bar = QWidget(self.central_widget)
+        self.top_bar.setGeometry(0, 0, self.width(), 80)
+        self.top_bar.setObjectName("topBar")
         
         top_layout = QHBoxLayout(self.top_bar)
         top_layout.setContentsMargins(20, 0, 20, 0)
         
         # Drawer toggle button (left side)
         self.drawer_toggle_btn = QPushButton()
-        self.drawer_toggle_btn.setIcon(QIcon("assets/menu.png"))  # Ensure you have this icon
+        self.drawer_toggle_btn.setIcon(_icon("assets/menu.png"))  # Ensure you have this icon
         self.drawer_toggle_btn.setIconSize(QSize(32, 32))
         self.drawer_toggle_btn.setFlat(True)
-        self.drawer_toggle_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                border: none;
-                color: white;
-            }
-            QPushButton:hover {
-                background-color: rgba(255, 255, 255, 20%);
-            }
-        """)
+        self.drawer_toggle_btn.setObjectName("drawerToggleBtn")
         self.drawer_toggle_btn.clicked.connect(self.toggle_drawer)
         top_layout.addWidget(self.drawer_toggle_btn)
         
@@ -136,19 +271,12 @@ class AttendanceSystemUI(QMainWindow):
         # Time label
         self.time_label = QLabel()
         self.time_label.setAlignment(Qt.AlignCenter)
-        self.time_label.setStyleSheet("""
-            color: white;
-            font-size: 32px;
-            font-weight: bold;
-        """)
+        self.time_label.setObjectName("timeLabel")
         
         # Date label
         self.date_label = QLabel()
         self.date_label.setAlignment(Qt.AlignCenter)
-        self.date_label.setStyleSheet("""
-            color: white;
-            font-size: 16px;
-        """)
+        self.date_label.setObjectName("dateLabel")
         
         clock_layout.addWidget(self.time_label)
         clock_layout.addWidget(self.date_label)
@@ -161,28 +289,9 @@ class AttendanceSystemUI(QMainWindow):
         # Login button (right side)
         self.login_btn = QPushButton("Login")
         self.login_btn.setMinimumSize(100, 40)
-        self.login_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 8px 15px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:pressed {
-                background-color: #1c6ea4;
-            }
-        """)
+        self.login_btn.setObjectName("loginBtn")
         top_layout.addWidget(self.login_btn)
         
-        # Add top bar to main layout
-        self.main_layout.addWidget(self.top_bar, 0, 0, 1, 2)
-        
         # Initial clock update
         self.update_clock()
         
@@ -192,10 +301,7 @@ class AttendanceSystemUI(QMainWindow):
         self.drawer = QWidget(self)
         self.drawer.setMinimumWidth(300)
         self.drawer.setMaximumWidth(300)
-        self.drawer.setStyleSheet("""
-            background-color: rgba(44, 62, 80, 95%);
-            border-right: 1px solid rgba(255, 255, 255, 30%);
-        """)
+        self.drawer.setObjectName("drawer")
         
         # Set initial position off-screen
         self.drawer.setGeometry(-300, 80, 300, self.height() - 80)
@@ -208,11 +314,7 @@ class AttendanceSystemUI(QMainWindow):
         # User info box
         self.user_box = QFrame()
         self.user_box.setFrameShape(QFrame.StyledPanel)
-        self.user_box.setStyleSheet("""
-            background-color: rgba(255, 255, 255, 10%);
-            border-radius: 10px;
-            padding: 10px;
-        """)
+        self.user_box.setObjectName("userBox")
         
         user_layout = QVBoxLayout(self.user_box)
         
@@ -221,18 +323,18 @@ class AttendanceSystemUI(QMainWindow):
         user_icon_layout.setAlignment(Qt.AlignCenter)
         
         user_icon = QLabel()
-        user_icon.setPixmap(QPixmap("assets/user.png").scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        user_icon.setPixmap(_pixmap("assets/user.png", 64))
         user_icon_layout.addWidget(user_icon)
         user_layout.addLayout(user_icon_layout)
         
         # Username and ID
         self.username_label = QLabel("Username")
         self.username_label.setAlignment(Qt.AlignCenter)
-        self.username_label.setStyleSheet("color: white; font-size: 16px; font-weight: bold;")
+        self.username_label.setObjectName("usernameLabel")
         
         self.user_id_label = QLabel("ID")
         self.user_id_label.setAlignment(Qt.AlignCenter)
-        self.user_id_label.setStyleSheet("color: rgba(255, 255, 255, 70%); font-size: 14px;")
+        self.user_id_label.setObjectName("userIdLabel")
         
         user_layout.addWidget(self.username_label)
         user_layout.addWidget(self.user_id_label)
@@ -242,7 +344,7 @@ class AttendanceSystemUI(QMainWindow):
         # Separator
         separator = QFrame()
         separator.setFrameShape(QFrame.HLine)
-        separator.setStyleSheet("background-color: rgba(255, 255, 255, 20%);")
+        separator.setObjectName("separator")
         drawer_layout.addWidget(separator)
         
         # Menu buttons
@@ -258,53 +360,42 @@ class AttendanceSystemUI(QMainWindow):
         
         # Check if icon exists
         if os.path.exists(icon_path):
-            button.setIcon(QIcon(icon_path))
+            button.setIcon(_icon(icon_path))
             button.setIconSize(QSize(24, 24))
         
-        button.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(255, 255, 255, 10%);
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 10px;
-                text-align: left;
-                font-size: 16px;
-            }
-            QPushButton:hover {
-                background-color: rgba(255, 255, 255, 20%);
-            }
-            QPushButton:pressed {
-                background-color: rgba(255, 255, 255, 30%);
-            }
-        """)
+        button.setObjectName("menuButton")
         
         parent_layout.addWidget(button)
         return button
         
     def update_clock(self):
         """Update the clock and date display"""
-        now = datetime.now()
+        timestamp = time.time()
+        now = time.localtime(timestamp)
         
         # Update time
-        time_str = now.strftime("%H:%M:%S")
+        time_str = time.strftime("%H:%M:%S", now)
         self.time_label.setText(time_str)
         
-        # Update date
-        date_str = now.strftime("%A, %d %B %Y")
-        self.date_label.setText(date_str)
+        # Update date only when the day rolls over
+        yday = (now.tm_year, now.tm_yday)
+        if yday != self._last_yday:
+            self._last_yday = yday
+            self.date_label.setText(time.strftime("%A, %d %B %Y", now))
+        
+        # Schedule the next update at the next full second to avoid drift
+        self.timer.start(1000 - int(timestamp % 1 * 1000))
         
     def toggle_drawer(self):
         """Toggle the drawer open/closed state"""
         target_x = 0 if not self.drawer_open else -300
         
-        # Create animation
-        self.animation = QPropertyAnimation(self.drawer, b"geometry")
+        # Animate position only; the drawer keeps its size so no relayout per frame
+        self.animation = QPropertyAnimation(self.drawer, b"pos")
         self.animation.setDuration(300)  # Animation duration in ms
         
-        current_geometry = self.drawer.geometry()
-        self.animation.setStartValue(current_geometry)
-        self.animation.setEndValue(QRect(target_x, 80, 300, self.height() - 80))
+        self.animation.setStartValue(self.drawer.pos())
+        self.animation.setEndValue(QPoint(target_x, 80))
         
         self.animation.start()
         
@@ -315,9 +406,15 @@ class AttendanceSystemUI(QMainWindow):
         """Handle window resize events"""
         super().resizeEvent(event)
         
-        # Resize background image
+        # Resize background image once the resize burst settles
         if hasattr(self, 'bg_label'):
-            self.resize_background()
+            self.bg_label.setGeometry(0, 0, self.width(), self.height())
+            if hasattr(self, '_bg_resize_timer'):
+                self._bg_resize_timer.start(50)
+        
+        # Keep the top bar across the full width
+        if hasattr(self, 'top_bar'):
+            self.top_bar.setGeometry(0, 0, self.width(), 80)
         
         # Update drawer height when window is resized
         if hasattr(self, 'drawer'):
@@ -327,6 +424,7 @@ class AttendanceSystemUI(QMainWindow):
         
 def main():
     app = QApplication(sys.argv)
+    app.setStyleSheet(APP_QSS)
     window = AttendanceSystemUI()
     window.show()
     sys.exit(app.exec_())
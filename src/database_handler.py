@@ -7,8 +7,13 @@ Modul ini menangani operasi database seperti membuat tabel dan menyimpan data ab
 """
 
 import os
+import re
+import time
+import queue
 import sqlite3
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
 # Konfigurasi logging
@@ -23,6 +28,64 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Penulis latar belakang: kumpulkan hingga sejumlah item atau selama jeda ini per transaksi
+WRITE_BATCH_SIZE = 256
+WRITE_BATCH_WINDOW = 0.05  # detik
+
+# Batch yang gagal karena database terkunci dicoba ulang dengan jeda yang berlipat
+WRITE_RETRIES = 5
+WRITE_RETRY_DELAY = 0.2  # detik, jeda percobaan ulang pertama
+
+# Kode kelas disisipkan ke nama tabel, jadi hanya karakter aman yang diizinkan
+CLASS_CODE_RE = re.compile(r"^[A-Za-z0-9_]{1,32}$")
+
+# Batas SELECT per query UNION ALL (SQLITE_MAX_COMPOUND_SELECT bawaan SQLite)
+UNION_CHUNK_SIZE = 500
+
+# Template query per tabel; teks SQL yang sama dipakai ulang agar statement cache sqlite3 kena
+STATEMENT_TEMPLATES = {
+    'insert': """
+        INSERT OR IGNORE INTO {table} (nim, name, meeting, timestamp, status)
+        VALUES (?, ?, ?, ?, 'pending')
+    """,
+    # Untuk tabel lama yang belum punya indeks unik (nim, meeting)
+    'insert_guarded': """
+        INSERT INTO {table} (nim, name, meeting, timestamp, status)
+        SELECT ?, ?, ?, ?, 'pending'
+        WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE nim = ? AND meeting = ?)
+    """,
+    'select_meeting': """
+        SELECT id, nim, name, meeting, timestamp, status
+        FROM {table}
+        WHERE meeting = ?
+        ORDER BY timestamp
+    """,
+    'select_all': """
+        SELECT id, nim, name, meeting, timestamp, status
+        FROM {table}
+        ORDER BY meeting, timestamp
+    """,
+}
+
+# (detik epoch, string) terakhir; absensi beruntun dalam detik yang sama tidak perlu strftime lagi
+_timestamp_cache = (None, "")
+
+def current_timestamp():
+    """
+    Waktu lokal saat ini dalam format database, diformat paling banyak sekali per detik.
+    
+    Returns:
+        str: Timestamp "%Y-%m-%d %H:%M:%S"
+    """
+    global _timestamp_cache
+    second = int(time.time())
+    cached_second, value = _timestamp_cache
+    if cached_second != second:
+        value = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+        # Satu assignment tuple, aman dibaca dari thread lain
+        _timestamp_cache = (second, value)
+    return value
+
 class DatabaseHandler:
     def __init__(self, db_path="database/attendance.db"):
         """
@@ -37,20 +100,247 @@ class DatabaseHandler:
         self.db_path = db_path
         logger.info(f"Inisialisasi database di {db_path}")
         
+        # Satu koneksi persisten dipakai bersama oleh semua thread (kamera dan UI),
+        # akses diserialkan dengan lock. Mode autocommit: transaksi eksplisit lewat transaction()
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        
+        try:
+            # Mode WAL tersimpan di file database: pembaca tidak memblokir penulis
+            # dan commit tidak perlu fsync penuh ke file database utama
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error as e:
+            logger.warning(f"Gagal mengaktifkan mode WAL: {str(e)}")
+            
+        # Aman dipakai dengan WAL; fsync hanya saat checkpoint
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        
+        # SQL per (jenis query, kode kelas), lihat statement()
+        self._statements = {}
+        
+        # Skema tidak berubah saat runtime: simpan nama tabel absensi yang sudah pasti ada
+        self._known_tables = {
+            row[0] for row in self.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'attendance_%'"
+            )
+        }
+        
+        # Tabel lama dibuat tanpa UNIQUE(nim, meeting), dikenali dari indeks lamanya
+        legacy_tables = [
+            row[0] for row in self.conn.execute(
+                "SELECT tbl_name FROM sqlite_master WHERE type='index' "
+                "AND name = 'idx_' || tbl_name || '_nim_meeting'"
+            )
+        ]
+        # Tabel yang gagal dimigrasi tetap dicek duplikatnya dengan WHERE NOT EXISTS
+        self._unindexed_tables = set()
+        for table_name in legacy_tables:
+            self._ensure_unique_index(table_name)
+            
+        # Callback opsional(class_code, meeting) setelah absensi baru tersimpan (dari thread penulis)
+        self.on_attendance_written = None
+        
+        # Callback opsional(class_code, nim, name, meeting, message) untuk absensi yang
+        # akhirnya gagal ditulis setelah semua percobaan ulang (dari thread penulis)
+        self.on_attendance_failed = None
+        
+        # Penulisan absensi dilakukan thread latar belakang agar kamera tidak menunggu fsync
+        self._write_queue = queue.Queue()
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="attendance-writer", daemon=True)
+        self._writer_thread.start()
+        
+    @contextmanager
     def get_connection(self):
         """
-        Membuat koneksi ke database.
+        Memakai koneksi persisten secara eksklusif.
         
-        Returns:
+        Yields:
             tuple: (connection, cursor) ke database
         """
+        with self._lock:
+            cursor = self.conn.cursor()
+            try:
+                yield self.conn, cursor
+            finally:
+                cursor.close()
+            
+    @contextmanager
+    def transaction(self):
+        """
+        Menjalankan beberapa query dalam satu transaksi (satu commit).
+        
+        Yields:
+            sqlite3.Cursor: Cursor untuk query di dalam transaksi
+        """
+        with self.get_connection() as (conn, cursor):
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+                
+    def _writer_loop(self):
+        """Mengambil absensi dari antrean dan menuliskannya per batch dalam satu transaksi."""
+        while True:
+            batch = [self._write_queue.get()]
+            deadline = time.monotonic() + WRITE_BATCH_WINDOW
+            while batch[-1] is not None and len(batch) < WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._write_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                    
+            items = [item for item in batch if item is not None]
+            try:
+                if items:
+                    self._write_with_retry(items)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+                    
+            # None adalah sinyal berhenti dari close()
+            if batch[-1] is None:
+                return
+                
+    def _write_with_retry(self, items):
+        """
+        Menulis satu batch, mencoba ulang saat database terkunci (SQLITE_BUSY dan sejenisnya).
+        Jika tetap gagal, setiap absensi dilaporkan lewat on_attendance_failed.
+        
+        Args:
+            items (list): Tuple (class_code, nim, name, meeting, timestamp)
+        """
+        delay = WRITE_RETRY_DELAY
+        for attempt in range(WRITE_RETRIES + 1):
+            try:
+                inserted = self._write_attendance(items)
+            except sqlite3.OperationalError as e:
+                error = e
+                if attempt < WRITE_RETRIES:
+                    logger.warning(f"Gagal menulis {len(items)} absensi ({str(e)}), "
+                                   f"coba lagi dalam {delay:.1f} detik")
+                    time.sleep(delay)
+                    delay *= 2
+            except Exception as e:
+                # Error selain database terkunci tidak akan hilang dengan dicoba ulang
+                error = e
+                break
+            else:
+                # Callback dipanggil setelah commit, di luar blok retry, agar error
+                # di UI tidak membuat absensi yang sudah tersimpan dilaporkan gagal
+                self._notify_written(items, inserted)
+                return
+                
+        logger.error(f"Absensi gagal dicatat untuk {len(items)} mahasiswa: {str(error)}")
+        if self.on_attendance_failed:
+            for class_code, nim, name, meeting, timestamp in items:
+                try:
+                    self.on_attendance_failed(class_code, nim, name, meeting, str(error))
+                except Exception as e:
+                    logger.error(f"Error di callback absensi gagal: {str(e)}")
+                    
+    def _notify_written(self, items, inserted):
+        """
+        Memanggil on_attendance_written sekali per (kelas, pertemuan) yang mendapat record baru.
+        
+        Args:
+            items (list): Tuple (class_code, nim, name, meeting, timestamp)
+            inserted (dict): Jumlah record baru per kelas dari _write_attendance()
+        """
+        if not self.on_attendance_written:
+            return
+        written = {(class_code, meeting) for class_code, nim, name, meeting, timestamp in items
+                   if inserted.get(class_code)}
+        for class_code, meeting in written:
+            try:
+                self.on_attendance_written(class_code, meeting)
+            except Exception as e:
+                logger.error(f"Error di callback absensi tercatat: {str(e)}")
+                
+    def flush(self):
+        """Menunggu sampai semua absensi di antrean selesai ditulis."""
+        self._write_queue.join()
+        
+    def close(self):
+        """Menuliskan sisa antrean lalu menutup koneksi database."""
+        if self._writer_thread.is_alive():
+            self._write_queue.put(None)
+            self._writer_thread.join(timeout=5)
+            if self._writer_thread.is_alive():
+                logger.warning("Thread penulis absensi belum selesai saat koneksi ditutup")
+        with self._lock:
+            self.conn.close()
+            
+    def table_name(self, class_code):
+        """
+        Mengembalikan nama tabel absensi untuk kode kelas yang sudah divalidasi.
+        
+        Args:
+            class_code (str): Kode kelas
+            
+        Returns:
+            str: Nama tabel, misalnya 'attendance_IF101'
+            
+        Raises:
+            ValueError: Jika kode kelas mengandung karakter yang tidak diizinkan
+        """
+        if not isinstance(class_code, str) or not CLASS_CODE_RE.match(class_code):
+            raise ValueError(f"Kode kelas tidak valid: {class_code!r}")
+        return f"attendance_{class_code}"
+        
+    def statement(self, kind, class_code):
+        """
+        Mengambil teks SQL untuk sebuah kelas dari cache, dibuat sekali per kelas.
+        
+        Args:
+            kind (str): Kunci di STATEMENT_TEMPLATES
+            class_code (str): Kode kelas
+            
+        Returns:
+            str: Teks SQL siap dieksekusi
+        """
+        key = (kind, class_code)
+        sql = self._statements.get(key)
+        if sql is None:
+            sql = STATEMENT_TEMPLATES[kind].format(table=self.table_name(class_code))
+            self._statements[key] = sql
+        return sql
+        
+    def _ensure_unique_index(self, table_name):
+        """
+        Mengganti indeks (nim, meeting) lama dengan indeks unik untuk tabel
+        yang dibuat sebelum ada constraint UNIQUE. Tabel yang sudah berisi record
+        ganda tidak diubah dan tetap memakai insert yang dijaga (insert_guarded).
+        
+        Args:
+            table_name (str): Nama tabel absensi
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            return conn, cursor
+            with self.transaction() as cursor:
+                cursor.execute(f"""
+                    SELECT 1 FROM {table_name}
+                    GROUP BY nim, meeting HAVING COUNT(*) > 1 LIMIT 1
+                """)
+                if cursor.fetchone():
+                    logger.warning(f"{table_name} berisi record ganda, indeks unik tidak dibuat")
+                    self._unindexed_tables.add(table_name)
+                    return
+                    
+                cursor.execute(f"""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_{table_name}_nim_meeting_unique
+                    ON {table_name} (nim, meeting)
+                """)
+                # Indeks lama yang tidak unik menjadi redundan
+                cursor.execute(f"DROP INDEX IF EXISTS idx_{table_name}_nim_meeting")
         except sqlite3.Error as e:
-            logger.error(f"Error saat membuat koneksi database: {str(e)}")
-            raise
+            logger.warning(f"Gagal membuat indeks unik di {table_name}: {str(e)}")
+            self._unindexed_tables.add(table_name)
             
     def ensure_table_exists(self, class_code):
         """
@@ -63,55 +353,56 @@ class DatabaseHandler:
         Returns:
             bool: True jika berhasil, False jika gagal
         """
-        table_name = f"attendance_{class_code}"
-        
         try:
-            conn, cursor = self.get_connection()
-            
-            # Cek apakah tabel sudah ada
-            cursor.execute(f"""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='{table_name}'
-            """)
+            table_name = self.table_name(class_code)
+        except ValueError as e:
+            logger.error(str(e))
+            return False
             
-            if cursor.fetchone() is None:
-                # Tabel belum ada, buat tabel baru
-                logger.info(f"Membuat tabel baru: {table_name}")
-                
-                cursor.execute(f"""
-                    CREATE TABLE {table_name} (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        nim TEXT NOT NULL,
-                        name TEXT NOT NULL,
-                        meeting INTEGER NOT NULL,
-                        timestamp TEXT NOT NULL,
-                        status TEXT NOT NULL DEFAULT 'pending'
-                    )
-                """)
-                
-                # Buat indeks untuk mempercepat query
-                cursor.execute(f"""
-                    CREATE INDEX idx_{table_name}_nim_meeting
-                    ON {table_name} (nim, meeting)
-                """)
+        if table_name in self._known_tables:
+            return True
+        
+        try:
+            with self.transaction() as cursor:
+                # Cek apakah tabel sudah ada
+                cursor.execute("""
+                    SELECT name FROM sqlite_master 
+                    WHERE type='table' AND name=?
+                """, (table_name,))
+                exists = cursor.fetchone() is not None
                 
-                conn.commit()
-                logger.info(f"Tabel {table_name} berhasil dibuat")
-            else:
+                if not exists:
+                    # Tabel belum ada, buat tabel baru
+                    logger.info(f"Membuat tabel baru: {table_name}")
+                    
+                    cursor.execute(f"""
+                        CREATE TABLE {table_name} (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            nim TEXT NOT NULL,
+                            name TEXT NOT NULL,
+                            meeting INTEGER NOT NULL,
+                            timestamp TEXT NOT NULL,
+                            status TEXT NOT NULL DEFAULT 'pending',
+                            UNIQUE (nim, meeting)
+                        )
+                    """)
+                    
+            if exists:
                 logger.info(f"Tabel {table_name} sudah ada")
+            else:
+                logger.info(f"Tabel {table_name} berhasil dibuat")
                 
-            conn.close()
+            self._known_tables.add(table_name)
             return True
             
         except sqlite3.Error as e:
             logger.error(f"Error saat membuat tabel {table_name}: {str(e)}")
-            if conn:
-                conn.close()
             return False
             
     def record_attendance(self, class_code, nim, name, meeting):
         """
-        Mencatat absensi mahasiswa jika belum ada dalam database.
+        Memasukkan absensi mahasiswa ke antrean penulisan; thread penulis mencatatnya
+        jika belum ada dalam database. Panggil flush() untuk menunggu hasilnya.
         
         Args:
             class_code (str): Kode kelas
@@ -124,47 +415,129 @@ class DatabaseHandler:
                 success (bool): True jika berhasil, False jika gagal
                 message (str): Pesan status operasi
         """
-        # Pastikan tabel sudah ada
-        if not self.ensure_table_exists(class_code):
-            return False, "Gagal memastikan tabel ada"
+        return self.record_attendance_batch(class_code, [(nim, name, meeting)])
             
-        table_name = f"attendance_{class_code}"
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def record_attendance_batch(self, class_code, rows):
+        """
+        Memasukkan absensi banyak mahasiswa ke antrean penulisan sekaligus. Thread penulis
+        mencatatnya dalam satu transaksi; mahasiswa yang sudah absen di pertemuan yang sama dilewati.
+        Panggil flush() untuk menunggu hasilnya.
         
-        try:
-            conn, cursor = self.get_connection()
+        Args:
+            class_code (str): Kode kelas
+            rows (iterable): Tuple (nim, name, meeting) untuk setiap mahasiswa
+            
+        Returns:
+            tuple: (success, message)
+                success (bool): True jika semua absensi masuk antrean
+                message (str): Pesan status operasi
+        """
+        if not self._writer_thread.is_alive():
+            return False, "Thread penulis absensi tidak berjalan"
+        if not isinstance(class_code, str) or not CLASS_CODE_RE.match(class_code):
+            logger.error(f"Kode kelas tidak valid: {class_code!r}")
+            return False, "Kode kelas tidak valid"
+            
+        # Waktu dicatat saat dikenali, bukan saat ditulis
+        timestamp = current_timestamp()
+        for nim, name, meeting in rows:
+            self._write_queue.put((class_code, nim, name, meeting, timestamp))
+        return True, "Absensi masuk antrean penulisan"
+        
+    def _write_attendance(self, items):
+        """
+        Menulis absensi dari beberapa kelas dalam satu transaksi; duplikat diabaikan.
+        
+        Args:
+            items (list): Tuple (class_code, nim, name, meeting, timestamp)
             
-            # Cek apakah mahasiswa sudah absen di pertemuan ini
-            cursor.execute(f"""
-                SELECT id FROM {table_name}
-                WHERE nim = ? AND meeting = ?
-            """, (nim, meeting))
+        Returns:
+            dict: Jumlah record baru per kelas
             
-            result = cursor.fetchone()
+        Raises:
+            sqlite3.Error: Jika tabel tidak bisa dipastikan ada atau transaksi gagal;
+                seluruh batch di-rollback
+        """
+        params_by_class = {}
+        for class_code, nim, name, meeting, timestamp in items:
+            params_by_class.setdefault(class_code, []).append((nim, name, meeting, timestamp))
             
-            if result is None:
-                # Mahasiswa belum absen, catat absensi baru
-                cursor.execute(f"""
-                    INSERT INTO {table_name} (nim, name, meeting, timestamp, status)
-                    VALUES (?, ?, ?, ?, 'pending')
-                """, (nim, name, meeting, timestamp))
+        # Pastikan tabel sudah ada; kegagalan (mis. database terkunci) menggagalkan batch
+        for class_code in params_by_class:
+            if not self.ensure_table_exists(class_code):
+                raise sqlite3.OperationalError(f"Gagal memastikan tabel ada - Kelas {class_code}")
                 
-                conn.commit()
+        inserted = {}
+        with self.transaction() as cursor:
+            for class_code, params in params_by_class.items():
+                if self.table_name(class_code) in self._unindexed_tables:
+                    params = [(nim, name, meeting, timestamp, nim, meeting)
+                              for nim, name, meeting, timestamp in params]
+                    cursor.executemany(self.statement('insert_guarded', class_code), params)
+                else:
+                    cursor.executemany(self.statement('insert', class_code), params)
+                inserted[class_code] = cursor.rowcount
                 
-                logger.info(f"Absensi berhasil dicatat: {nim} ({name}) - Kelas {class_code} Pertemuan {meeting}")
-                conn.close()
-                return True, "Absensi berhasil dicatat"
+        for class_code, count in inserted.items():
+            logger.info(f"Absensi dicatat: {count} baru dari {len(params_by_class[class_code])} - Kelas {class_code}")
+            
+        return inserted
+            
+    def _iter_attendance_rows(self, class_code, meeting=None, chunk_size=500):
+        """
+        Mengalirkan baris absensi mentah per potongan tanpa memuat semuanya ke memori.
+        Lock koneksi hanya dipegang selama fetch, tidak selama baris diproses pemanggil.
+        
+        Args:
+            class_code (str): Kode kelas
+            meeting (int, optional): Nomor pertemuan. Jika None, ambil semua pertemuan.
+            chunk_size (int): Jumlah baris per fetch
+            
+        Yields:
+            tuple: (id, nim, name, meeting, timestamp, status)
+        """
+        # Pastikan tabel sudah ada (juga memvalidasi kode kelas)
+        if not self.ensure_table_exists(class_code):
+            return
+            
+        with self._lock:
+            if meeting is not None:
+                # Ambil data untuk pertemuan tertentu
+                cursor = self.conn.execute(self.statement('select_meeting', class_code), (meeting,))
             else:
-                # Mahasiswa sudah absen sebelumnya
-                logger.info(f"Mahasiswa {nim} ({name}) sudah absen di Kelas {class_code} Pertemuan {meeting}")
-                conn.close()
-                return True, "Mahasiswa sudah absen sebelumnya"
+                # Ambil semua data
+                cursor = self.conn.execute(self.statement('select_all', class_code))
                 
-        except sqlite3.Error as e:
-            logger.error(f"Error saat mencatat absensi: {str(e)}")
-            if conn:
-                conn.close()
-            return False, f"Error: {str(e)}"
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+            
+    def iter_attendance_data(self, class_code, meeting=None):
+        """
+        Mengalirkan data absensi untuk kelas dan pertemuan tertentu.
+        
+        Args:
+            class_code (str): Kode kelas
+            meeting (int, optional): Nomor pertemuan. Jika None, ambil semua pertemuan.
+            
+        Yields:
+            dict: Satu record absensi
+        """
+        for row in self._iter_attendance_rows(class_code, meeting):
+            yield {
+                'id': row[0],
+                'nim': row[1],
+                'name': row[2],
+                'meeting': row[3],
+                'timestamp': row[4],
+                'status': row[5]
+            }
             
     def get_attendance_data(self, class_code, meeting=None):
         """
@@ -177,52 +550,11 @@ class DatabaseHandler:
         Returns:
             list: List data absensi
         """
-        table_name = f"attendance_{class_code}"
-        
         try:
-            # Pastikan tabel sudah ada
-            if not self.ensure_table_exists(class_code):
-                return []
-                
-            conn, cursor = self.get_connection()
-            
-            if meeting is not None:
-                # Ambil data untuk pertemuan tertentu
-                cursor.execute(f"""
-                    SELECT id, nim, name, meeting, timestamp, status 
-                    FROM {table_name}
-                    WHERE meeting = ?
-                    ORDER BY timestamp
-                """, (meeting,))
-            else:
-                # Ambil semua data
-                cursor.execute(f"""
-                    SELECT id, nim, name, meeting, timestamp, status 
-                    FROM {table_name}
-                    ORDER BY meeting, timestamp
-                """)
-                
-            rows = cursor.fetchall()
-            
-            # Konversi ke list of dict untuk kemudahan penggunaan
-            result = []
-            for row in rows:
-                result.append({
-                    'id': row[0],
-                    'nim': row[1],
-                    'name': row[2],
-                    'meeting': row[3],
-                    'timestamp': row[4],
-                    'status': row[5]
-                })
-                
-            conn.close()
-            return result
+            return list(self.iter_attendance_data(class_code, meeting))
             
         except sqlite3.Error as e:
             logger.error(f"Error saat mengambil data absensi: {str(e)}")
-            if 'conn' in locals() and conn:
-                conn.close()
             return []
             
     def update_attendance_status(self, class_code, ids, new_status='success'):
@@ -240,33 +572,114 @@ class DatabaseHandler:
         if not ids:
             return True
             
-        table_name = f"attendance_{class_code}"
-        
         try:
-            conn, cursor = self.get_connection()
+            table_name = self.table_name(class_code)
             
             # Buat placeholder untuk query IN
             placeholders = ', '.join(['?'] * len(ids))
             
-            # Update status
-            cursor.execute(f"""
-                UPDATE {table_name}
-                SET status = ?
-                WHERE id IN ({placeholders})
-            """, [new_status] + ids)
+            with self.get_connection() as (conn, cursor):
+                # Update status
+                cursor.execute(f"""
+                    UPDATE {table_name}
+                    SET status = ?
+                    WHERE id IN ({placeholders})
+                """, [new_status] + ids)
+                
+                updated_count = cursor.rowcount
+                
+            logger.info(f"Berhasil mengupdate {updated_count} record di {table_name}")
+            return True
             
-            conn.commit()
+        except (sqlite3.Error, ValueError) as e:
+            logger.error(f"Error saat mengupdate status: {str(e)}")
+            return False
             
-            updated_count = cursor.rowcount
-            logger.info(f"Berhasil mengupdate {updated_count} record di {table_name}")
+    def get_all_pending_ids(self, class_codes=None):
+        """
+        Mengambil ID semua record berstatus 'pending' dari semua tabel kelas dengan
+        satu query UNION ALL per kelompok tabel (maksimal UNION_CHUNK_SIZE SELECT).
+        
+        Args:
+            class_codes (list, optional): Daftar kode kelas. Jika None, ambil dari semua tabel absensi.
+            
+        Returns:
+            dict: Mapping {class_code: [id, ...]} hanya untuk kelas yang memiliki record pending
+            
+        Raises:
+            sqlite3.Error: Jika query gagal, agar pemanggil tidak mengira tidak ada data pending
+        """
+        with self.get_connection() as (conn, cursor):
+            # Cari tabel absensi yang sudah ada
+            cursor.execute("""
+                SELECT name FROM sqlite_master
+                WHERE type='table' AND name LIKE 'attendance_%'
+            """)
+            existing = {row[0][len("attendance_"):] for row in cursor.fetchall()}
+            existing = {code for code in existing if CLASS_CODE_RE.match(code)}
+            
+            if class_codes is None:
+                codes = sorted(existing)
+            else:
+                codes = [code for code in class_codes if code in existing]
+                
+            result = {}
+            for start in range(0, len(codes), UNION_CHUNK_SIZE):
+                chunk = codes[start:start + UNION_CHUNK_SIZE]
+                query = " UNION ALL ".join(
+                    f"SELECT ?, id FROM attendance_{code} WHERE status = 'pending'"
+                    for code in chunk
+                )
+                cursor.execute(query, chunk)
+                
+                for class_code, record_id in cursor.fetchall():
+                    result.setdefault(class_code, []).append(record_id)
+                    
+        return result
+            
+    def bulk_update_status(self, ids_by_class, new_status='success'):
+        """
+        Mengupdate status absensi untuk banyak kelas dalam satu transaksi.
+        
+        Args:
+            ids_by_class: Mapping {class_code: [id, ...]} atau iterable pasangan (class_code, id)
+            new_status (str): Status baru ('pending' atau 'success')
             
-            conn.close()
+        Returns:
+            bool: True jika berhasil, False jika gagal
+        """
+        if not isinstance(ids_by_class, dict):
+            # Kelompokkan pasangan (class_code, id) per kelas
+            grouped = {}
+            for class_code, record_id in ids_by_class:
+                grouped.setdefault(class_code, []).append(record_id)
+            ids_by_class = grouped
+            
+        if not any(ids_by_class.values()):
             return True
             
-        except sqlite3.Error as e:
+        try:
+            updated_count = 0
+            with self.transaction() as cursor:
+                for class_code, ids in ids_by_class.items():
+                    if not ids:
+                        continue
+                        
+                    # Buat placeholder untuk query IN
+                    placeholders = ', '.join(['?'] * len(ids))
+                    
+                    cursor.execute(f"""
+                        UPDATE {self.table_name(class_code)}
+                        SET status = ?
+                        WHERE id IN ({placeholders})
+                    """, [new_status] + list(ids))
+                    updated_count += cursor.rowcount
+                    
+            logger.info(f"Berhasil mengupdate {updated_count} record di {len(ids_by_class)} kelas")
+            return True
+            
+        except (sqlite3.Error, ValueError) as e:
             logger.error(f"Error saat mengupdate status: {str(e)}")
-            if 'conn' in locals() and conn:
-                conn.close()
             return False
             
     def export_attendance_to_csv(self, class_code, meeting=None, filepath=None):
@@ -285,10 +698,15 @@ class DatabaseHandler:
         """
         import csv
         
-        # Ambil data absensi
-        data = self.get_attendance_data(class_code, meeting)
-        
-        if not data:
+        # Alirkan data absensi; baris pertama diambil dulu untuk memastikan ada data
+        rows = self._iter_attendance_rows(class_code, meeting)
+        try:
+            first = next(rows, None)
+        except sqlite3.Error as e:
+            logger.error(f"Error saat mengambil data absensi: {str(e)}")
+            return False, None
+            
+        if first is None:
             logger.warning(f"Tidak ada data untuk diekspor - Kelas {class_code}")
             return False, None
             
@@ -305,11 +723,12 @@ class DatabaseHandler:
         try:
             with open(filepath, 'w', newline='') as csvfile:
                 fieldnames = ['id', 'nim', 'name', 'meeting', 'timestamp', 'status']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer = csv.writer(csvfile)
                 
-                writer.writeheader()
-                for row in data:
-                    writer.writerow(row)
+                # Urutan kolom query sama dengan header, jadi tuple ditulis langsung tanpa dict
+                writer.writerow(fieldnames)
+                writer.writerow(first)
+                writer.writerows(rows)
                     
             logger.info(f"Data berhasil diekspor ke {filepath}")
             return True, filepath
@@ -317,6 +736,9 @@ class DatabaseHandler:
         except Exception as e:
             logger.error(f"Error saat mengekspor data: {str(e)}")
             return False, None
+            
+        finally:
+            rows.close()
 
 # Contoh penggunaan
 if __name__ == "__main__":
@@ -327,6 +749,9 @@ if __name__ == "__main__":
     success, message = db.record_attendance("IF101", "118130001", "soara", 1)
     print(f"Status: {success}, Message: {message}")
     
+    # Tunggu sampai antrean absensi selesai ditulis
+    db.flush()
+    
     # Contoh mendapatkan data absensi
     data = db.get_attendance_data("IF101", 1)
     for item in data:
@@ -13,8 +13,43 @@ import numpy as np
 import logging
 import face_recognition
 import time
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
+# FAISS is optional; without it matching always uses the NumPy int8 path
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Known-encoding count from which a FAISS index is used for matching
+FAISS_MIN_ENCODINGS = 1000
+
+# Numba is optional; it compiles the small-N nearest-neighbour loop below
+try:
+    import numba
+except ImportError:
+    numba = None
+
+if numba is not None:
+    @numba.njit(fastmath=True, cache=True)
+    def _nearest_int8(enc_q, enc_scales, enc_sq_norms, query_q, query_scale, query_sq_norm):
+        """Return (index, squared L2 distance) of the known encoding closest to the query."""
+        best = -1
+        best_sq = np.inf
+        for i in range(enc_q.shape[0]):
+            dot = 0
+            for j in range(enc_q.shape[1]):
+                dot += np.int32(enc_q[i, j]) * np.int32(query_q[j])
+            sq = enc_sq_norms[i] + query_sq_norm - 2.0 * dot / (enc_scales[i] * query_scale)
+            if sq < best_sq:
+                best_sq = sq
+                best = i
+        return best, best_sq
+else:
+    _nearest_int8 = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,27 +62,139 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# KCF tracker factory; only shipped with opencv-contrib, tracking is skipped without it
+_create_tracker = getattr(cv2, "TrackerKCF_create", None) or \
+    getattr(getattr(cv2, "legacy", None), "TrackerKCF_create", None)
+
+class CameraReader:
+    """Read camera frames on a background thread, keeping only the most recent one."""
+    
+    def __init__(self, camera_index=0):
+        """
+        Open the camera and start the reader thread.
+        
+        Args:
+            camera_index: Index of the camera to use
+        """
+        self.cap = cv2.VideoCapture(camera_index)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Keep the driver queue short as well
+        
+        self.cond = threading.Condition()
+        self.frame = None
+        self.ret = True
+        self.fresh = False               # True until the current frame has been read
+        self.running = self.cap.isOpened()
+        
+        if self.running:
+            self.thread = threading.Thread(target=self._loop, daemon=True)
+            self.thread.start()
+            
+    def isOpened(self):
+        """Return True if the camera opened and the reader thread is running."""
+        return self.running
+        
+    def _loop(self):
+        """Grab frames as fast as the camera delivers them, overwriting the previous one."""
+        while self.running:
+            ret, frame = self.cap.read()
+            with self.cond:
+                self.ret, self.frame, self.fresh = ret, frame, True
+                self.cond.notify()
+            if not ret:
+                break
+                
+    def read(self, timeout=1.0):
+        """
+        Wait for a frame newer than the last one returned.
+        
+        Args:
+            timeout (float): Seconds to wait for a new frame
+            
+        Returns:
+            Tuple of (ret, frame) like cv2.VideoCapture.read()
+        """
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.fresh, timeout):
+                return False, None
+            self.fresh = False
+            return self.ret, self.frame
+            
+    def release(self):
+        """Stop the reader thread and release the camera."""
+        self.running = False
+        if hasattr(self, "thread"):
+            self.thread.join(timeout=2)
+        self.cap.release()
+
+def quantize_encodings(encodings):
+    """
+    Quantize encodings to int8 with one symmetric scale per row.
+    
+    Args:
+        encodings: (N, 128) or (128,) float array
+        
+    Returns:
+        Tuple of (int8 array, float32 scales) such that encodings ~= q / scales
+    """
+    encodings = np.asarray(encodings, dtype=np.float32)
+    peak = np.abs(encodings).max(axis=-1, keepdims=True)
+    scales = 127.0 / np.maximum(peak, np.finfo(np.float32).tiny)
+    quantized = np.rint(encodings * scales).astype(np.int8)
+    return quantized, scales.squeeze(-1)
+
 class FaceDetector:
-    def __init__(self, encodings_path="models/encodings.pkl", detection_method="hog", db_handler=None):
+    def __init__(self, encodings_path="models/encodings.npz", detection_method="hog", db_handler=None,
+                 scale_factor=0.5, detect_width=None):
         """
         Initialize the face detector.
         
         Args:
-            encodings_path (str): Path to the pickled encodings file
+            encodings_path (str): Path to the .npz encodings file (legacy .pkl is also accepted)
             detection_method (str): Method for face detection ('hog' or 'cnn')
             db_handler: Database handler untuk menyimpan hasil absensi
+            scale_factor (float): Scale applied to frames before detection; boxes are
+                scaled back to the original frame size for drawing
+            detect_width (int): If set, frames are scaled to this width before detection
+                instead of using a fixed scale_factor
         """
         self.encodings_path = encodings_path
         self.detection_method = detection_method
         self.data = self.load_encodings()
+        self.enc_q = None                # (N, 128) int8 known encodings, see build_index()
+        self.enc_scales = None           # (N,) per-row scales, encoding ~= enc_q / enc_scales
+        self.enc_sq_norms = None         # (N,) squared norms of the dequantized rows
+        self.enc_deq = None              # (N, 128) float32 dequantized rows, NumPy fallback only
+        self.faiss_index = None          # Exact L2 FAISS index for large enrollments
+        self._index_dirty = True
         self.frame_count = 0
         self.last_recognition_time = {}  # To track last recognition time per person
         self.recognition_cooldown = 5    # Seconds between recognitions of the same person
         
         # Detection parameters
-        self.frame_skip = 2              # Process every Nth frame for performance
-        self.scale_factor = 0.5          # Scale factor for input frames
+        self.frame_skip = 3              # Process every Nth frame for performance
+        self.scale_factor = scale_factor # Scale factor for input frames
+        self.detect_width = detect_width # Target detection width, overrides scale_factor
         self.min_confidence = 0.5        # Minimum confidence for recognition
+        self.match_tolerance = 0.5       # Maximum encoding distance for a match
+        self.motion_threshold = 5.0      # Mean gray-level diff below which a frame is treated as unchanged
+        self.refresh_interval = 30       # Frames after which recognition runs even without motion
+        self.last_recognition_frame = 0  # frame_count of the last recognition pass
+        self.detect_every = 15           # Frames between detections while faces are tracked
+        
+        # KCF trackers following the faces of the last recognition pass
+        self.trackers = []               # List of (tracker, color, label)
+        
+        # Results of the last recognition pass, reused on skipped frames
+        self.last_boxes = []             # List of (top, right, bottom, left, color, label)
+        self.prev_gray = None            # Grayscale small frame of the last recognition pass
+        self._rgb_buf = None             # Reused RGB conversion buffer for embed()
+        self._small_buf = None           # Reused downscaled frame buffer for downscale()
+        
+        # Recently recognized faces keyed by a coarse hash of the face crop,
+        # so a student lingering in frame skips the encoding network
+        self.recog_cache = OrderedDict() # key -> (timestamp, (student_id, name, confidence))
+        self.recog_cache_size = 256
+        self.recog_cache_ttl = 30        # Seconds before a cached recognition expires
         
         # Visualization settings
         self.font = cv2.FONT_HERSHEY_SIMPLEX
@@ -62,17 +209,98 @@ class FaceDetector:
         self.active_meeting = None
         
     def load_encodings(self):
-        """Load the known face encodings from the pickle file."""
+        """Load the known face encodings from the .npz file (or a legacy pickle)."""
         try:
-            logger.info(f"Loading encodings from {self.encodings_path}")
-            with open(self.encodings_path, "rb") as f:
-                data = pickle.load(f)
+            path = self._resolve_encodings_path()
+            self._encodings_mtime = os.path.getmtime(path)
+            
+            logger.info(f"Loading encodings from {path}")
+            if path.endswith(".npz"):
+                with np.load(path) as npz:
+                    data = {
+                        "encodings": npz["encodings"],
+                        "encodings_q": npz["encodings_q"],
+                        "scales": npz["scales"],
+                        "ids": npz["ids"].tolist(),
+                        "names": npz["names"].tolist(),
+                    }
+            else:
+                with open(path, "rb") as f:
+                    data = pickle.load(f)
             logger.info(f"Loaded {len(data['encodings'])} encodings")
             return data
         except Exception as e:
             logger.error(f"Error loading encodings: {str(e)}")
+            self._encodings_mtime = None
             return {"encodings": [], "ids": [], "names": []}
             
+    def _resolve_encodings_path(self):
+        """Return the encodings file to load, falling back to the pickle written by older training runs."""
+        path = self.encodings_path
+        legacy_path = os.path.splitext(path)[0] + ".pkl"
+        if not os.path.exists(path) and os.path.exists(legacy_path):
+            return legacy_path
+        return path
+        
+    def _encodings_changed(self):
+        """Check whether the encodings file was rewritten since it was last loaded."""
+        try:
+            return os.path.getmtime(self._resolve_encodings_path()) != self._encodings_mtime
+        except OSError:
+            return self._encodings_mtime is not None
+            
+    def build_index(self):
+        """
+        Stack the known encodings into one contiguous int8 matrix used for matching.
+        
+        Uses the quantized encodings saved by training.py when present, otherwise
+        quantizes the float encodings here.
+        
+        Once built, the index is only reloaded and rebuilt when the encodings
+        file has changed on disk since it was last loaded.
+        """
+        if self.enc_q is not None:
+            if not self._encodings_changed():
+                self._index_dirty = False
+                return
+            self.data = self.load_encodings()
+            
+        if "encodings_q" in self.data:
+            enc_q, scales = self.data["encodings_q"], self.data["scales"]
+        elif len(self.data["encodings"]):
+            enc_q, scales = quantize_encodings(np.vstack(self.data["encodings"]))
+        else:
+            enc_q, scales = np.empty((0, 128), dtype=np.int8), np.empty(0, dtype=np.float32)
+            
+        self.enc_q = np.ascontiguousarray(enc_q, dtype=np.int8)
+        self.enc_scales = np.asarray(scales, dtype=np.float32)
+        wide = self.enc_q.astype(np.int32)
+        self.enc_sq_norms = np.einsum("ij,ij->i", wide, wide) / self.enc_scales ** 2
+        
+        # Large enrollments search the dequantized encodings with FAISS' SIMD kernels
+        self.faiss_index = None
+        if faiss is not None and len(self.enc_q) >= FAISS_MIN_ENCODINGS:
+            self.faiss_index = faiss.IndexFlatL2(self.enc_q.shape[1])
+            self.faiss_index.add(np.ascontiguousarray(self.enc_q / self.enc_scales[:, None], dtype=np.float32))
+            
+        # Without FAISS or numba, match() needs float32 rows: NumPy sends float32
+        # matrix-vector products to BLAS, but not integer ones
+        self.enc_deq = None
+        if self.faiss_index is None and _nearest_int8 is None:
+            self.enc_deq = np.ascontiguousarray(self.enc_q / self.enc_scales[:, None], dtype=np.float32)
+            
+        # Compile (or load from cache) the numba kernel now rather than on the first face
+        if _nearest_int8 is not None and len(self.enc_q):
+            _nearest_int8(self.enc_q, self.enc_scales, self.enc_sq_norms, self.enc_q[0], 1.0, 0.0)
+            
+        self._index_dirty = False
+        self.recog_cache.clear()
+        logger.info(f"Built encoding index with {len(self.enc_q)} entries")
+        
+    def mark_index_dirty(self):
+        """Request an encodings reload and index rebuild before the next recognition if the file changed."""
+        self._index_dirty = True
+            
     def set_active_class(self, class_code, meeting):
         """
         Set kelas dan pertemuan aktif untuk absensi.
@@ -83,6 +311,13 @@ class FaceDetector:
         """
         self.active_class_code = class_code
         self.active_meeting = meeting
+        
+        # Reset per-session state so a reused detector starts clean
+        self.last_recognition_time = {}
+        self.last_boxes = []
+        self.prev_gray = None
+        self.trackers = []
+        self.recog_cache.clear()
         logger.info(f"Set active class to {class_code}, meeting {meeting}")
             
     def recognize_faces(self, frame):
@@ -95,85 +330,311 @@ class FaceDetector:
         Returns:
             Tuple of (processed frame, list of identified people)
         """
-        # Skip frames for better performance
+        # While faces are tracked, only follow them and re-detect every detect_every frames
         self.frame_count += 1
+        if self.trackers and self.frame_count - self.last_recognition_frame < self.detect_every:
+            self.track_faces(frame)
+            return frame, []
+            
+        # Skip frames for better performance, redrawing the last known boxes
         if self.frame_count % self.frame_skip != 0:
+            self.draw_boxes(frame, self.last_boxes)
             return frame, []
             
-        # Resize frame for faster processing
-        small_frame = cv2.resize(frame, (0, 0), fx=self.scale_factor, fy=self.scale_factor)
+        small_frame = self.downscale(frame)
         
-        # Convert from BGR (OpenCV format) to RGB (face_recognition format)
-        rgb_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+        # Skip recognition when the scene barely changed since the last recognition pass,
+        # but still refresh every refresh_interval frames so stale boxes do not linger
+        gray = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY)
+        if self.prev_gray is not None and self.prev_gray.shape == gray.shape and \
+           self.frame_count - self.last_recognition_frame < self.refresh_interval and \
+           cv2.absdiff(gray, self.prev_gray).mean() < self.motion_threshold:
+            self.draw_boxes(frame, self.last_boxes)
+            return frame, []
+        self.prev_gray = gray
+        self.last_recognition_frame = self.frame_count
         
-        # Find all face locations and encodings in the current frame
-        face_locations = face_recognition.face_locations(rgb_frame, model=self.detection_method)
+        # Rebuild the encoding index if enrollment changed
+        if self._index_dirty:
+            self.build_index()
+        
+        # Find all face locations on the grayscale frame
+        face_locations = self.detect(gray)
         
         if not face_locations:
+            self.last_boxes = []
+            self.trackers = []
             return frame, []
             
-        face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
+        # Reuse cached recognitions; compute encodings in color only for the misses
+        current_time = time.time()
+        cache_keys = [self.face_key(gray, location) for location in face_locations]
+        results = [self.get_cached_recognition(key, current_time) for key in cache_keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+        
+        if misses:
+            face_encodings = self.embed(small_frame, [face_locations[i] for i in misses])
+            for i, face_encoding in zip(misses, face_encodings):
+                results[i] = self.match(face_encoding)
+                if results[i][0] != "Unknown":
+                    self.cache_recognition(cache_keys[i], results[i], current_time)
         
         # Initialize lists for identification results
         recognized_ids = []
         recognized_names = []
+        to_record = []
+        boxes = []
         
-        # Draw boxes and labels for each detected face
-        for (top, right, bottom, left), face_encoding in zip(face_locations, face_encodings):
+        # Identify each detected face
+        for (top, right, bottom, left), (student_id, name, confidence) in zip(face_locations, results):
             # Adjust coordinates to original frame size
             top = int(top / self.scale_factor)
             right = int(right / self.scale_factor)
             bottom = int(bottom / self.scale_factor)
             left = int(left / self.scale_factor)
             
-            # Compare face with known encodings
-            matches = face_recognition.compare_faces(
-                self.data["encodings"], 
-                face_encoding, 
-                tolerance=0.5  # Lower value = more strict matching
-            )
-            
-            name = "Unknown"
-            student_id = "Unknown"
             color = self.unknown_color
-            
-            # If there's a match, use the first one
-            if True in matches:
-                # Find all indexes where there's a match
-                matched_indexes = [i for i, match in enumerate(matches) if match]
+            if student_id != "Unknown":
+                color = self.box_color
                 
-                # Calculate face distances to find the closest match
-                face_distances = face_recognition.face_distance(
-                    self.data["encodings"], face_encoding
-                )
-                
-                # Get index of the closest match (smallest distance)
-                best_match_index = np.argmin(face_distances)
+                # Check if we need to apply cooldown for this person
+                if student_id not in self.last_recognition_time or \
+                   (current_time - self.last_recognition_time[student_id]) > self.recognition_cooldown:
+                    recognized_ids.append(student_id)
+                    recognized_names.append(name)
+                    self.last_recognition_time[student_id] = current_time
+                    
+                    logger.info(f"Recognized: {name} (ID: {student_id}) with confidence: {confidence:.2f}")
+                    
+                    # Antrekan absensi untuk dicatat ke database jika ada database handler dan kelas aktif
+                    if self.db_handler and self.active_class_code and self.active_meeting:
+                        to_record.append((student_id, name))
+            
+            label = f"{name} ({student_id})" if student_id != "Unknown" else "Unknown"
+            boxes.append((top, right, bottom, left, color, label))
+            
+        # Draw the boxes and keep them for the skipped frames that follow
+        self.last_boxes = boxes
+        self.draw_boxes(frame, boxes)
+        self.start_trackers(small_frame, face_locations, boxes)
+        
+        # Hand all new recognitions of this pass to the database writer in one call
+        if to_record:
+            self.record_attendance_batch_to_db(to_record)
+            
+        # Return the processed frame and the list of recognized people
+        return frame, list(zip(recognized_ids, recognized_names))
+        
+    def downscale(self, frame):
+        """
+        Resize a frame to the detection size.
+        
+        Args:
+            frame: Full-size BGR frame
+            
+        Returns:
+            Frame scaled by self.scale_factor, in a buffer reused across calls
+        """
+        if self.detect_width:
+            self.scale_factor = min(1.0, self.detect_width / frame.shape[1])
+            
+        # Resize into the previous buffer; OpenCV only reallocates if the size changed
+        size = (round(frame.shape[1] * self.scale_factor), round(frame.shape[0] * self.scale_factor))
+        self._small_buf = cv2.resize(frame, size, dst=self._small_buf, interpolation=cv2.INTER_AREA)
+        return self._small_buf
+        
+    def start_trackers(self, small_frame, face_locations, boxes):
+        """
+        Start one KCF tracker per recognized face, replacing the previous trackers.
+        
+        Args:
+            small_frame: Downscaled frame the faces were detected on
+            face_locations: List of (top, right, bottom, left) locations on small_frame
+            boxes: Matching (top, right, bottom, left, color, label) boxes on the full frame
+        """
+        self.trackers = []
+        if _create_tracker is None:
+            return
+            
+        for (top, right, bottom, left), box in zip(face_locations, boxes):
+            tracker = _create_tracker()
+            tracker.init(small_frame, (left, top, right - left, bottom - top))
+            self.trackers.append((tracker, box[4], box[5]))
+            
+    def track_faces(self, frame):
+        """
+        Move the last boxes along with the tracked faces and draw them.
+        
+        Args:
+            frame: Full-size BGR frame (modified in place)
+        """
+        small_frame = self.downscale(frame)
+        
+        boxes = []
+        trackers = []
+        for tracker, color, label in self.trackers:
+            ok, (x, y, w, h) = tracker.update(small_frame)
+            if not ok:
+                continue
                 
-                # If the best match is in our matched indexes, use it
-                if best_match_index in matched_indexes:
-                    confidence = 1 - face_distances[best_match_index]
+            # Adjust coordinates to original frame size
+            top = int(y / self.scale_factor)
+            right = int((x + w) / self.scale_factor)
+            bottom = int((y + h) / self.scale_factor)
+            left = int(x / self.scale_factor)
+            boxes.append((top, right, bottom, left, color, label))
+            trackers.append((tracker, color, label))
+            
+        self.trackers = trackers
+        self.last_boxes = boxes
+        self.draw_boxes(frame, boxes)
+        
+    def match(self, face_encoding):
+        """
+        Find the known person closest to a face encoding.
+        
+        Args:
+            face_encoding: 128-d face encoding
+            
+        Returns:
+            Tuple of (student_id, name, confidence); id and name are "Unknown" if no match
+        """
+        if not len(self.enc_q):
+            return "Unknown", "Unknown", 0.0
+            
+        query = face_encoding.astype(np.float32)
+        if self.faiss_index is not None:
+            # Nearest neighbour straight from FAISS (returns squared L2 distance)
+            sq_distance, index = self.faiss_index.search(query.reshape(1, -1), 1)
+            best_match_index = int(index[0, 0])
+            distance = float(np.sqrt(max(sq_distance[0, 0], 0)))
+        elif _nearest_int8 is not None:
+            # Same int8 distance as below in one compiled loop, without NumPy call overhead
+            query_q, query_scale = quantize_encodings(query)
+            best_match_index, sq_distance = _nearest_int8(
+                self.enc_q, self.enc_scales, self.enc_sq_norms,
+                query_q, float(query_scale), float(query.dot(query))
+            )
+            distance = float(np.sqrt(max(sq_distance, 0)))
+        else:
+            # Distances to all known encodings from one float32 (BLAS) matrix-vector product
+            # on the dequantized rows: |a - q|^2 = |a|^2 + |q|^2 - 2 a.q
+            sq_distances = self.enc_sq_norms + query.dot(query) - 2 * (self.enc_deq @ query)
+            face_distances = np.sqrt(np.maximum(sq_distances, 0))
+            
+            # Get index of the closest match (smallest distance)
+            best_match_index = int(np.argmin(face_distances))
+            distance = float(face_distances[best_match_index])
+            
+        confidence = 1 - distance
+        
+        # Accept only within tolerance (lower value = more strict matching) and confident enough
+        if distance <= self.match_tolerance and confidence >= self.min_confidence:
+            return (self.data["ids"][best_match_index],
+                    self.data["names"][best_match_index],
+                    confidence)
                     
-                    # Only accept if confidence is high enough
-                    if confidence >= self.min_confidence:
-                        student_id = self.data["ids"][best_match_index]
-                        name = self.data["names"][best_match_index]
-                        color = self.box_color
-                        
-                        # Check if we need to apply cooldown for this person
-                        current_time = time.time()
-                        if student_id not in self.last_recognition_time or \
-                           (current_time - self.last_recognition_time[student_id]) > self.recognition_cooldown:
-                            recognized_ids.append(student_id)
-                            recognized_names.append(name)
-                            self.last_recognition_time[student_id] = current_time
-                            
-                            logger.info(f"Recognized: {name} (ID: {student_id}) with confidence: {confidence:.2f}")
-                            
-                            # Catat absensi ke database jika ada database handler dan kelas aktif
-                            if self.db_handler and self.active_class_code and self.active_meeting:
-                                self.record_attendance_to_db(student_id, name)
+        return "Unknown", "Unknown", 0.0
+        
+    def face_key(self, gray, location):
+        """
+        Build a coarse cache key for a face: its position bucket plus a 16x16 average hash.
+        
+        Args:
+            gray: Grayscale frame the face was detected on
+            location: (top, right, bottom, left) face location
+            
+        Returns:
+            Hashable key, or None if the crop is empty
+        """
+        top, right, bottom, left = location
+        crop = gray[max(top, 0):bottom, max(left, 0):right]
+        if crop.size == 0:
+            return None
+            
+        thumb = cv2.resize(crop, (16, 16), interpolation=cv2.INTER_AREA)
+        bits = np.packbits(thumb > thumb.mean()).tobytes()
+        return (top // 16, left // 16, bits)
+        
+    def get_cached_recognition(self, key, now):
+        """
+        Look up a recent recognition result for a face key.
+        
+        Args:
+            key: Key from face_key()
+            now (float): Current time in seconds
+            
+        Returns:
+            Cached (student_id, name, confidence) or None on miss/expiry
+        """
+        entry = self.recog_cache.get(key) if key is not None else None
+        if entry is None:
+            return None
+            
+        timestamp, result = entry
+        if now - timestamp > self.recog_cache_ttl:
+            del self.recog_cache[key]
+            return None
+            
+        self.recog_cache.move_to_end(key)
+        return result
+        
+    def cache_recognition(self, key, result, now):
+        """
+        Store a recognition result, evicting the least recently used entry when full.
+        
+        Args:
+            key: Key from face_key()
+            result: (student_id, name, confidence) tuple
+            now (float): Current time in seconds
+        """
+        if key is None:
+            return
+            
+        self.recog_cache[key] = (now, result)
+        self.recog_cache.move_to_end(key)
+        if len(self.recog_cache) > self.recog_cache_size:
+            self.recog_cache.popitem(last=False)
+        
+    def detect(self, gray):
+        """
+        Locate faces in a grayscale frame.
+        
+        Args:
+            gray: Single-channel uint8 frame
             
+        Returns:
+            List of (top, right, bottom, left) face locations
+        """
+        return face_recognition.face_locations(gray, model=self.detection_method)
+        
+    def embed(self, frame, face_locations):
+        """
+        Compute face encodings for already detected faces.
+        
+        Args:
+            frame: BGR frame the locations were detected on
+            face_locations: List of (top, right, bottom, left) face locations
+            
+        Returns:
+            List of 128-d face encodings
+        """
+        # Convert from BGR (OpenCV format) to RGB (face_recognition format)
+        # into a buffer reused across frames of the same size
+        if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+            self._rgb_buf = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+        return face_recognition.face_encodings(self._rgb_buf, face_locations)
+        
+    def draw_boxes(self, frame, boxes):
+        """
+        Draw bounding boxes and labels on the frame.
+        
+        Args:
+            frame: Video frame to draw on (modified in place)
+            boxes: List of (top, right, bottom, left, color, label) tuples
+        """
+        for top, right, bottom, left, color, label in boxes:
             # Draw bounding box and label
             cv2.rectangle(frame, (left, top), (right, bottom), color, 2)
             
@@ -181,11 +642,7 @@ class FaceDetector:
             cv2.rectangle(frame, (left, bottom - 35), (right, bottom), color, cv2.FILLED)
             
             # Add text with name/id
-            label = f"{name} ({student_id})" if student_id != "Unknown" else "Unknown"
             cv2.putText(frame, label, (left + 6, bottom - 6), self.font, 0.6, (255, 255, 255), 1)
-            
-        # Return the processed frame and the list of recognized people
-        return frame, list(zip(recognized_ids, recognized_names))
         
     def record_attendance_to_db(self, student_id, name):
         """
@@ -221,6 +678,32 @@ class FaceDetector:
             logger.error(f"Error saat mencatat absensi ke database: {str(e)}")
             return False, str(e)
         
+    def record_attendance_batch_to_db(self, people):
+        """
+        Menyerahkan absensi beberapa mahasiswa ke antrean penulis database sekaligus.
+        Penulisan sebenarnya terjadi di thread penulis DatabaseHandler.
+        
+        Args:
+            people (list): Tuple (student_id, name)
+        
+        Returns:
+            tuple: (success, message) dari operasi database
+        """
+        try:
+            rows = [(student_id, name, self.active_meeting) for student_id, name in people]
+            success, message = self.db_handler.record_attendance_batch(self.active_class_code, rows)
+            
+            if success:
+                logger.info(f"Berhasil mengantrekan {len(rows)} absensi ke database")
+            else:
+                logger.error(f"Gagal mencatat absensi ke database: {message}")
+                
+            return success, message
+            
+        except Exception as e:
+            logger.error(f"Error saat mencatat absensi ke database: {str(e)}")
+            return False, str(e)
+        
     def start_camera(self, camera_index=0, window_name="Face Recognition", callback=None, 
                      class_code=None, meeting=None):
         """
@@ -238,23 +721,25 @@ class FaceDetector:
             if class_code and meeting:
                 self.set_active_class(class_code, meeting)
                 
-            # Initialize the camera
+            # Initialize the camera; frames are read on a background thread so
+            # slow recognition never gets a stale buffered frame
             logger.info(f"Starting camera feed from index {camera_index}")
-            camera = cv2.VideoCapture(camera_index)
+            camera = CameraReader(camera_index)
             
             # Check if camera opened successfully
             if not camera.isOpened():
                 logger.error("Unable to open camera")
+                camera.release()
                 return False
                 
             # Set camera properties if needed
-            # camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            # camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+            # camera.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+            # camera.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
             
             logger.info("Camera started successfully")
             
             while True:
-                # Capture frame-by-frame
+                # Take the most recent frame from the reader thread
                 ret, frame = camera.read()
                 
                 if not ret:
@@ -16,6 +16,9 @@ def detect_faces():
     # Untuk menampilkan FPS (frame per second)
     prev_time = 0
     
+    # Buffer frame kecil dipakai ulang setiap iterasi
+    small_frame = None
+    
     while True:
         # Baca frame dari kamera
         ret, frame = video_capture.read()
@@ -31,10 +34,12 @@ def detect_faces():
         
         # Resize frame untuk mempercepat proses (opsional)
         #* 0.5 untuk mempercepat deteksi wajah (setengah ukuran)
-        small_frame = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
+        height, width = frame.shape[:2]
+        small_frame = cv2.resize(frame, (width // 2, height // 2), dst=small_frame,
+                                 interpolation=cv2.INTER_AREA)
         
-        # Konversi dari BGR (OpenCV) ke RGB (face_recognition)
-        rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+        # Konversi dari BGR (OpenCV) ke RGB (face_recognition) langsung di buffer small_frame
+        rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB, dst=small_frame)
         
         # Deteksi lokasi wajah di frame
         face_locations = face_recognition.face_locations(rgb_small_frame)
@@ -3,17 +3,19 @@
 
 """
 Train face recognition model for attendance system.
-This script processes images from dataset/raw folder and creates encodings.pkl file.
+This script processes images from dataset/raw folder and creates encodings.npz file.
 """
 
 import os
-import pickle
 import logging
 import time
-import glob
 import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import dlib
 import face_recognition
 import cv2
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
@@ -30,9 +32,14 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Filename format: [ID9DIGIT]_[NAMA]_[NOMOR].jpg
+FILENAME_RE = re.compile(r"(\d{9})_([a-zA-Z]+)_\d+\.jpg")
+
+PROCESSED_DIR = "dataset/processed"
+
 def setup_directories():
     """Create necessary directories if they don't exist."""
-    Path("dataset/processed").mkdir(parents=True, exist_ok=True)
+    Path(PROCESSED_DIR).mkdir(parents=True, exist_ok=True)
     Path("models").mkdir(exist_ok=True)
     Path("logs").mkdir(exist_ok=True)
 
@@ -43,8 +50,7 @@ def extract_info_from_filename(filename):
     """
     try:
         base = os.path.basename(filename)
-        pattern = r"(\d{9})_([a-zA-Z]+)_\d+\.jpg"
-        match = re.match(pattern, base)
+        match = FILENAME_RE.match(base)
         
         if match:
             student_id = match.group(1)
@@ -57,17 +63,125 @@ def extract_info_from_filename(filename):
         logger.error(f"Error extracting info from {filename}: {str(e)}")
         return None, None
 
+def _init_worker():
+    """Disable OpenCV's own thread pool in each worker process."""
+    cv2.setNumThreads(0)
+
+def load_rgb_image(image_path):
+    """Load an image and convert it from BGR (OpenCV) to RGB (face_recognition)."""
+    image = cv2.imread(image_path)
+    if image is None:
+        logger.warning(f"Could not load image: {image_path}")
+        return None
+    # Convert in place; the BGR image is not needed afterwards
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+
+def encode_face(image_path, rgb_image, face_locations):
+    """
+    Compute the encoding of the single face in an image and save its processed copy.
+    
+    Returns:
+        128-d face encoding, or None if the image does not hold exactly one usable face
+    """
+    # Skip if no face or multiple faces detected
+    if len(face_locations) != 1:
+        logger.warning(f"Found {len(face_locations)} faces in {image_path}. Skipping...")
+        return None
+    
+    encodings = face_recognition.face_encodings(rgb_image, face_locations)
+    if len(encodings) == 0:
+        logger.warning(f"Could not compute encoding for {image_path}")
+        return None
+    
+    # Save processed image to processed directory
+    save_processed_image(image_path, rgb_image)
+    return encodings[0]
+
+def save_processed_image(image_path, rgb_image):
+    """Write a decoded image to the processed directory, through a BGR view of the RGB array."""
+    processed_path = os.path.join(PROCESSED_DIR, os.path.basename(image_path))
+    cv2.imwrite(processed_path, rgb_image[:, :, ::-1])
+
+def _encode_one(image_path):
+    """Load, detect and encode one image with the HOG detector (runs in a worker process)."""
+    rgb_image = load_rgb_image(image_path)
+    if rgb_image is None:
+        return None
+    
+    face_locations = face_recognition.face_locations(rgb_image, model="hog")
+    return encode_face(image_path, rgb_image, face_locations)
+
+def encode_images_batched(image_paths, batch_size=32):
+    """
+    Encode images on the GPU, detecting faces with dlib's CNN detector in batches.
+    
+    Batches must share one image size, so images are grouped by shape.
+    
+    Returns:
+        List of face encodings (or None), in the same order as image_paths
+    """
+    results = [None] * len(image_paths)
+    images = {}
+    groups = {}
+    
+    for index, image_path in enumerate(image_paths):
+        rgb_image = load_rgb_image(image_path)
+        if rgb_image is not None:
+            images[index] = rgb_image
+            groups.setdefault(rgb_image.shape, []).append(index)
+    
+    for indexes in groups.values():
+        batch = [images[index] for index in indexes]
+        locations = face_recognition.batch_face_locations(
+            batch, number_of_times_to_upsample=1, batch_size=batch_size
+        )
+        for index, face_locations in zip(indexes, locations):
+            results[index] = encode_face(image_paths[index], images[index], face_locations)
+    
+    return results
+
+def encode_images(image_paths):
+    """
+    Compute one face encoding per image.
+    
+    With CUDA, faces are detected in GPU batches. Otherwise images are
+    processed in parallel on a process pool, one image per task.
+    
+    Returns:
+        List of face encodings (or None), in the same order as image_paths
+    """
+    if not image_paths:
+        return []
+    
+    if dlib.DLIB_USE_CUDA:
+        logger.info("CUDA available, detecting faces with batched CNN detector")
+        return encode_images_batched(image_paths)
+    
+    logger.info(f"Encoding images on {os.cpu_count()} processes")
+    # Spawned workers import numpy/dlib fresh and inherit this environment, so the
+    # OpenMP limit is in place before their thread pools start (a forked worker
+    # would keep the parent's already initialised pools)
+    os.environ["OMP_NUM_THREADS"] = "1"
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=context,
+                             initializer=_init_worker) as executor:
+        return list(executor.map(_encode_one, image_paths, chunksize=4))
+
 def process_images():
     """
     Process all images in dataset/raw folder, extract face encodings,
-    and save to models/encodings.pkl
+    and save to models/encodings.npz
     """
     start_time = time.time()
     raw_dir = "dataset/raw"
-    processed_dir = "dataset/processed"
     
     # Get all jpg files in the raw directory
-    image_paths = glob.glob(os.path.join(raw_dir, "*.jpg"))
+    # scandir reads the file type from the directory entry, no stat() per file
+    image_paths = []
+    if os.path.isdir(raw_dir):
+        with os.scandir(raw_dir) as entries:
+            image_paths = [entry.path for entry in entries
+                           if entry.name.endswith(".jpg") and entry.is_file()]
     
     if not image_paths:
         logger.error(f"No images found in {raw_dir}")
@@ -80,78 +194,65 @@ def process_images():
     known_ids = []
     known_names = []
     
-    # Process each image
-    successful_encodings = 0
-    processed_images = 0
+    # Extract ID and name from filenames
+    valid_paths = []
+    valid_ids = []
+    valid_names = []
     
-    for i, image_path in enumerate(image_paths):
-        # Extract ID and name from filename
+    for image_path in image_paths:
         student_id, name = extract_info_from_filename(image_path)
         
         if not student_id or not name:
             logger.warning(f"Skipping {image_path} due to invalid filename format")
             continue
         
-        # Load image
-        logger.info(f"Processing image {i+1}/{len(image_paths)}: {os.path.basename(image_path)}")
-        image = cv2.imread(image_path)
-        
-        if image is None:
-            logger.warning(f"Could not load image: {image_path}")
-            continue
-        
-        # Convert from BGR (OpenCV format) to RGB (face_recognition format)
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        # Detect face locations
-        face_locations = face_recognition.face_locations(rgb_image, model="hog")
-        
-        # Skip if no face or multiple faces detected
-        if len(face_locations) != 1:
-            logger.warning(f"Found {len(face_locations)} faces in {image_path}. Skipping...")
+        valid_paths.append(image_path)
+        valid_ids.append(student_id)
+        valid_names.append(name)
+    
+    # Compute encodings for all images in parallel
+    encodings = encode_images(valid_paths)
+    
+    # Collect successful encodings
+    successful_encodings = 0
+    processed_images = len(valid_paths)
+    
+    for image_path, encoding, student_id, name in zip(valid_paths, encodings, valid_ids, valid_names):
+        if encoding is None:
             continue
         
-        # Compute face encodings
-        encodings = face_recognition.face_encodings(rgb_image, face_locations)
+        # Add encoding and metadata to lists
+        known_encodings.append(encoding)
+        known_ids.append(student_id)
+        known_names.append(name)
+        successful_encodings += 1
         
-        if len(encodings) > 0:
-            # Add encoding and metadata to lists
-            known_encodings.append(encodings[0])
-            known_ids.append(student_id)
-            known_names.append(name)
-            successful_encodings += 1
-            
-            # Save processed image to processed directory
-            processed_path = os.path.join(processed_dir, os.path.basename(image_path))
-            cv2.imwrite(processed_path, image)
-            
-            logger.debug(f"Successfully encoded: {image_path}")
-        else:
-            logger.warning(f"Could not compute encoding for {image_path}")
-        
-        processed_images += 1
+        logger.debug(f"Successfully encoded: {image_path}")
         
     # Save encodings to file if any were successful
     if successful_encodings > 0:
-        data = {
-            "encodings": known_encodings,
-            "ids": known_ids,
-            "names": known_names,
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "total_faces": successful_encodings
-        }
+        # int8 copy with one scale per row (encoding ~= encodings_q / scales) used for matching
+        matrix = np.vstack(known_encodings).astype(np.float32)
+        scales = 127.0 / np.maximum(np.abs(matrix).max(axis=1), np.finfo(np.float32).tiny)
         
-        # Save as pickle file
-        with open("models/encodings.pkl", "wb") as f:
-            pickle.dump(data, f)
-
+        # Save as one .npz of flat arrays (no pickled objects, loads without per-element unpickling)
+        np.savez(
+            "models/encodings.npz",
+            encodings=matrix,
+            encodings_q=np.rint(matrix * scales[:, None]).astype(np.int8),
+            scales=scales,
+            ids=np.asarray(known_ids, dtype=str),
+            names=np.asarray(known_names, dtype=str),
+            created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            total_faces=successful_encodings
+        )
         
         elapsed_time = time.time() - start_time
         
         logger.info(f"Training completed in {elapsed_time:.2f} seconds")
         logger.info(f"Processed {processed_images} images")
         logger.info(f"Created {successful_encodings} face encodings")
-        logger.info(f"Saved encodings to models/encodings.pkl")
+        logger.info(f"Saved encodings to models/encodings.npz")
         
         return True
     else: